@@ -1,10 +1,18 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, ImageJob, Location, Post
+from .paginators import EstimatedCountPaginator
 
 
 @admin.register(Post)
 class BlogAdmin(admin.ModelAdmin):
+    """
+    Changelist of posts running the same queries for any page size: the
+    related objects are joined, the category choices of list_editable are
+    loaded once per request and big tables are counted by the planner
+    estimate.
+    """
+
     list_display = (
         'title',
         'is_published',
@@ -19,9 +27,40 @@ class BlogAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('category', 'author')
     list_display_links = ('title',)
+    list_select_related = ('author', 'location', 'category')
+    autocomplete_fields = ('author', 'location')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = 'Не задано'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """
+        Loads the category choices once per request, otherwise every row
+        form of the changelist queries the categories to render its select
+        and the form class, built several times, counts them.
+        """
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'category':
+            if not hasattr(request, 'category_choices'):
+                request.category_choices = list(iter(formfield.choices))
+            formfield.choices = request.category_choices
+        return formfield
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('image', 'post', 'status', 'attempts', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('post',)
+    readonly_fields = ('post', 'image', 'attempts', 'started_at', 'error')
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = ('name',)
+
 
 admin.site.register(Category)
-admin.site.register(Location)
 admin.site.register(Comment)
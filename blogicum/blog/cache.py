@@ -0,0 +1,42 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def make_key(*parts):
+    """Joins the parts into a cache key of the blog."""
+    return ':'.join(['blog', *(str(part) for part in parts)])
+
+
+def get_generation(name):
+    """
+    Returns the current generation of the named group of cache entries.
+    Entries keyed by an old generation are never read again.
+    """
+    return get_generations(name)[0]
+
+
+def get_generations(*names):
+    """Returns the generations of several groups in one cache round trip."""
+    keys = [make_key('generation', name) for name in names]
+    generations = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in generations}
+    if missing:
+        cache.set_many(missing, None)
+        generations.update(missing)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(*names):
+    """Makes all entries of the named groups stale."""
+    cache.set_many(
+        {make_key('generation', name): time.time_ns() for name in names},
+        None
+    )
+
+
+def make_page_key(request, *parts):
+    """Returns the cache key of the page requested by the full URL."""
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return make_key('page', *parts, path)
@@ -0,0 +1,123 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp'}
+
+ORIENTATION = 0x0112
+
+
+def get_image_storage():
+    """Returns the storage of Post.image."""
+    from .models import Post
+
+    return Post._meta.get_field('image').storage
+
+
+def rendition_name(name, rendition):
+    """Returns the file name of the rendition stored next to the original."""
+    root, _ = os.path.splitext(name)
+    _, image_format = settings.POST_IMAGE_RENDITIONS[rendition]
+    return f'{root}.{rendition}.{EXTENSIONS[image_format]}'
+
+
+def resize(image, width, image_format):
+    """Scales the image down to the width and prepares it for the format."""
+    if image.width > width:
+        image = image.resize(
+            (width, max(round(image.height * width / image.width), 1)),
+            Image.Resampling.LANCZOS
+        )
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    return image
+
+
+def generate_renditions(name, storage=None, force=False):
+    """
+    Generates the missing renditions of the original image and returns
+    the names of the created files.
+    """
+    storage = storage or get_image_storage()
+    renditions = [
+        rendition for rendition in settings.POST_IMAGE_RENDITIONS
+        if force or not storage.exists(rendition_name(name, rendition))
+    ]
+    if not renditions:
+        return []
+    created = []
+    with storage.open(name, 'rb') as original, Image.open(original) as image:
+        image = ImageOps.exif_transpose(image)
+        for rendition in renditions:
+            width, image_format = settings.POST_IMAGE_RENDITIONS[rendition]
+            buffer = BytesIO()
+            resize(image, width, image_format).save(
+                buffer,
+                image_format,
+                quality=settings.POST_IMAGE_QUALITY,
+                optimize=True,
+            )
+            target = rendition_name(name, rendition)
+            if storage.exists(target):
+                storage.delete(target)
+            created.append(
+                storage.save(target, ContentFile(buffer.getvalue()))
+            )
+    return created
+
+
+def validate_image(name, storage=None):
+    """
+    Fully decodes the image, raises an error if the file is not a valid
+    image or is too large to decode safely.
+    """
+    storage = storage or get_image_storage()
+    with storage.open(name, 'rb') as original, Image.open(original) as image:
+        image.load()
+
+
+def strip_exif(name, storage=None):
+    """
+    Rewrites the original image without EXIF metadata, applying the EXIF
+    orientation first. Keeps JPEG quantization tables if no rotation is
+    needed, so the image is not recompressed.
+    """
+    storage = storage or get_image_storage()
+    with storage.open(name, 'rb') as original, Image.open(original) as image:
+        exif = image.getexif()
+        if not exif:
+            return False
+        image_format = image.format
+        options = {'icc_profile': image.info.get('icc_profile')}
+        if image_format == 'JPEG' and exif.get(ORIENTATION, 1) == 1:
+            options['quality'] = 'keep'
+            cleaned = image
+        else:
+            cleaned = ImageOps.exif_transpose(image)
+            cleaned.info.pop('exif', None)
+            if image_format in ('JPEG', 'WEBP'):
+                options['quality'] = 95
+        buffer = BytesIO()
+        cleaned.save(buffer, image_format, **options)
+    storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+    return True
+
+
+def get_rendition_urls(name, storage=None):
+    """
+    Returns the URLs of the existing renditions by their names, renditions
+    that are not generated yet are skipped.
+    """
+    storage = storage or get_image_storage()
+    urls = {}
+    for rendition in settings.POST_IMAGE_RENDITIONS:
+        target = rendition_name(name, rendition)
+        if storage.exists(target):
+            urls[rendition] = storage.url(target)
+    return urls
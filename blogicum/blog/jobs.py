@@ -0,0 +1,83 @@
+import logging
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from .cache import bump_generation
+from .images import generate_renditions, strip_exif, validate_image
+from .models import ImageJob, Post
+
+logger = logging.getLogger(__name__)
+
+INVALID_IMAGE_ERRORS = (
+    UnidentifiedImageError, Image.DecompressionBombError, SyntaxError
+)
+
+
+def enqueue_image_job(post):
+    """Adds the job processing the current image of the post."""
+    return ImageJob.objects.create(post=post, image=post.image.name)
+
+
+def claim_next_job():
+    """
+    Marks the oldest pending job as processing and returns it, or None
+    if the queue is empty. The conditional update lets several workers
+    share the queue without row locks.
+    """
+    while True:
+        job = ImageJob.objects.filter(status=ImageJob.PENDING).first()
+        if job is None:
+            return None
+        claimed = ImageJob.objects.filter(
+            pk=job.pk, status=ImageJob.PENDING
+        ).update(
+            status=ImageJob.PROCESSING,
+            attempts=F('attempts') + 1,
+            started_at=timezone.now(),
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job):
+    """
+    Validates the image, strips EXIF and generates renditions.
+    Invalid images are removed from the post, other errors are retried
+    up to POST_IMAGE_JOB_MAX_ATTEMPTS times. Cached pages showing the post
+    are dropped once its image is removed or its renditions are ready.
+    """
+    storage = Post._meta.get_field('image').storage
+    try:
+        validate_image(job.image, storage)
+        strip_exif(job.image, storage)
+        generate_renditions(job.image, storage, force=True)
+    except INVALID_IMAGE_ERRORS as error:
+        logger.warning('Invalid image %s: %s', job.image, error)
+        Post.objects.filter(pk=job.post_id, image=job.image).update(image='')
+        storage.delete(job.image)
+        reset_post_pages(job.post_id)
+        return finish_job(job, ImageJob.FAILED, error)
+    except (OSError, ValueError) as error:
+        logger.exception('Could not process image %s', job.image)
+        if job.attempts < settings.POST_IMAGE_JOB_MAX_ATTEMPTS:
+            return finish_job(job, ImageJob.PENDING, error)
+        return finish_job(job, ImageJob.FAILED, error)
+    reset_post_pages(job.post_id)
+    return finish_job(job, ImageJob.DONE)
+
+
+def reset_post_pages(post_id):
+    """Drops the cached post lists, the cached page and card of the post."""
+    bump_generation(f'post:{post_id}', 'list_pages', 'feed')
+
+
+def finish_job(job, status, error=''):
+    """Saves the result of the job."""
+    job.status = status
+    job.error = str(error)
+    job.save(update_fields=('status', 'error'))
+    return job
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import bump_generation
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    """Fills the stored excerpts of posts from their text."""
+
+    help = (
+        'Заполняет сохранённое начало текста публикаций, например после '
+        'изменения POST_EXCERPT_WORDS или массового обновления текста.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, обрабатываемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        fixed = 0
+        while True:
+            with transaction.atomic():
+                posts = list(
+                    Post.objects.filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .only('pk', 'text', 'excerpt')
+                    .select_for_update()[:batch_size]
+                )
+                if not posts:
+                    break
+                outdated = []
+                for post in posts:
+                    excerpt = make_excerpt(post.text)
+                    if post.excerpt != excerpt:
+                        post.excerpt = excerpt
+                        outdated.append(post)
+                Post.objects.bulk_update(outdated, ['excerpt'])
+            fixed += len(outdated)
+            last_pk = posts[-1].pk
+        if fixed:
+            # bulk_update sends no signals, so drop the cached pages here.
+            bump_generation('posts', 'feed', 'list_pages')
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {fixed}')
+        )
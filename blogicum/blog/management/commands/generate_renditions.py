@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions
+from blog.models import Post
+
+
+def process_image(name, force):
+    """Generates renditions of one image, returns the error if any."""
+    try:
+        return name, len(generate_renditions(name, force=force)), None
+    except (OSError, ValueError) as error:
+        return name, 0, str(error)
+
+
+class Command(BaseCommand):
+    """Generates missing renditions of existing post images."""
+
+    help = (
+        'Создаёт недостающие уменьшенные копии изображений публикаций '
+        'в нескольких процессах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество процессов для обработки изображений.'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать уже существующие копии.'
+        )
+
+    def handle(self, *args, **options):
+        names = list(
+            Post.objects.exclude(image='')
+            .order_by()
+            .values_list('image', flat=True)
+            .distinct()
+        )
+        created = 0
+        with ProcessPoolExecutor(options['processes']) as executor:
+            results = executor.map(
+                partial(process_image, force=options['force']),
+                names,
+                chunksize=16,
+            )
+            for name, count, error in results:
+                if error:
+                    self.stderr.write(f'{name}: {error}')
+                created += count
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {len(names)}, '
+            f'создано копий: {created}'
+        ))
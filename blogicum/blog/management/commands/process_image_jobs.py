@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from blog.jobs import claim_next_job, run_job
+from blog.models import ImageJob
+
+
+class Command(BaseCommand):
+    """Processes the queue of uploaded post images."""
+
+    help = (
+        'Проверяет загруженные изображения публикаций, удаляет EXIF '
+        'и создаёт уменьшенные копии в фоновом режиме.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать задачи из очереди и завершить работу.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2,
+            help='Пауза в секундах, если очередь пуста.'
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help=(
+                'Через сколько секунд вернуть в очередь задачу, '
+                'обработка которой прервалась.'
+            )
+        )
+
+    def requeue_stale(self, stale_after):
+        """
+        Returns jobs of crashed workers back to the queue, jobs that used
+        up POST_IMAGE_JOB_MAX_ATTEMPTS are failed, so an image crashing
+        the worker is not processed forever.
+        """
+        stale = ImageJob.objects.filter(
+            status=ImageJob.PROCESSING,
+            started_at__lt=timezone.now() - timedelta(seconds=stale_after),
+        )
+        stale.filter(
+            attempts__gte=settings.POST_IMAGE_JOB_MAX_ATTEMPTS
+        ).update(
+            status=ImageJob.FAILED,
+            error='Обработка прервалась слишком много раз.',
+        )
+        stale.update(status=ImageJob.PENDING)
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            self.requeue_stale(options['stale_after'])
+            job = claim_next_job()
+            while job is not None:
+                job = run_job(job)
+                processed += 1
+                if job.status == ImageJob.FAILED:
+                    self.stderr.write(f'{job.image}: {job.error}')
+                job = claim_next_job()
+            if options['once']:
+                break
+            close_old_connections()
+            time.sleep(options['sleep'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано задач: {processed}')
+        )
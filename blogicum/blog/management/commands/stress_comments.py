@@ -0,0 +1,130 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Writes comments from several threads while others read the feed."""
+
+    help = (
+        'Проверяет добавление комментариев в нескольких потоках '
+        'одновременно с чтением ленты, завершается с ошибкой, если '
+        'какой-либо запрос не выполнен.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=4,
+            help='Количество потоков, добавляющих комментарии.'
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Количество потоков, читающих ленту.'
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=25,
+            help='Количество комментариев от каждого потока.'
+        )
+
+    def handle(self, *args, **options):
+        name = f'stress-{uuid.uuid4().hex[:8]}'
+        user = User.objects.create_user(name)
+        category = Category.objects.create(
+            title=name, description=name, slug=name
+        )
+        post = Post.objects.create(
+            title=name, text=name, pub_date=timezone.now(),
+            author=user, category=category,
+        )
+        try:
+            # Without caches every feed request reads the database.
+            with override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+                }},
+            ):
+                errors = self.run_threads(user, post, options)
+            post.refresh_from_db()
+            expected = options['writers'] * options['comments']
+            self.stdout.write(
+                f'Комментариев: {post.comments.count()} из {expected}, '
+                f'счётчик: {post.comment_count}, ошибок: {len(errors)}'
+            )
+            if errors or post.comment_count != expected:
+                raise CommandError('\n'.join(errors[:10]))
+        finally:
+            user.delete()
+            category.delete()
+
+    def run_threads(self, user, post, options):
+        """Runs writers and readers, returns the errors of the requests."""
+        errors = []
+        writing = threading.Event()
+        writing.set()
+        writers = [
+            threading.Thread(target=self.run, args=(
+                errors, self.write, user, post, options['comments']
+            ))
+            for _ in range(options['writers'])
+        ]
+        readers = [
+            threading.Thread(target=self.run, args=(
+                errors, self.read, writing
+            ))
+            for _ in range(options['readers'])
+        ]
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writing.clear()
+        for thread in readers:
+            thread.join()
+        return errors
+
+    @staticmethod
+    def run(errors, target, *args):
+        """Collects the errors of the thread and closes its connections."""
+        try:
+            errors.extend(target(*args))
+        except Exception as error:
+            errors.append(repr(error))
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def write(user, post, comments):
+        client = Client()
+        client.force_login(user)
+        url = reverse('blog:add_comment', args=[post.pk])
+        for number in range(comments):
+            response = client.post(url, {'text': f'Комментарий {number}'})
+            if response.status_code != 302:
+                yield f'{url}: {response.status_code}'
+
+    @staticmethod
+    def read(writing):
+        client = Client()
+        while writing.is_set():
+            response = client.get('/')
+            if response.status_code != 200:
+                yield f'/: {response.status_code}'
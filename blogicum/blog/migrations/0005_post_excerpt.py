@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:23
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('pk', 'text')[:1000]
+        )
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt = Truncator(post.text).words(
+                settings.POST_EXCERPT_WORDS, truncate=' …'
+            )
+        Post.objects.bulk_update(posts, ['excerpt'])
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Заполняется автоматически при сохранении публикации.', verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,31 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Count
 from django.utils import timezone
+from django.utils.text import Truncator
 
 User = get_user_model()
 
 
+def published_now():
+    """
+    Returns the current time rounded down to PUBLISHED_NOW_BUCKET seconds,
+    so the published filter stays the same within the bucket and the
+    queries using it can be cached for the bucket duration.
+    """
+    now = timezone.now().replace(microsecond=0)
+    return now - timedelta(
+        seconds=int(now.timestamp()) % settings.PUBLISHED_NOW_BUCKET
+    )
+
+
+def make_excerpt(text):
+    """Returns the beginning of the text shown in post lists."""
+    return Truncator(text).words(settings.POST_EXCERPT_WORDS, truncate=' …')
+
+
 class BaseModel(models.Model):
     """Base class for all models."""
 
@@ -74,7 +93,6 @@ class PostQuerySet(models.QuerySet):
         return (
             self.select_related('author', 'location', 'category')
             .all()
-            .annotate(comment_count=Count('comments'))
             .order_by('-pub_date')
         )
 
@@ -86,15 +104,12 @@ class PostQuerySet(models.QuerySet):
         return self.filter(
             is_published=True,
             category__is_published=True,
-            pub_date__lte=timezone.now(),
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+            pub_date__lte=published_now(),
+        ).order_by('-pub_date')
 
 
 class PublishedPostManager(models.Manager):
-    """
-    Uses QuerySet to get all published posts and display count of published
-    comments for the post.
-    """
+    """Uses QuerySet to get all published posts with related objects."""
 
     def get_queryset(self) -> PostQuerySet:
         return (
@@ -112,6 +127,12 @@ class Post(BaseModel):
         verbose_name='Заголовок'
     )
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста',
+        help_text='Заполняется автоматически при сохранении публикации.'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -139,6 +160,13 @@ class Post(BaseModel):
         verbose_name='Категория',
         related_name='posts'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+        help_text='Обновляется автоматически при добавлении и удалении '
+                  'комментариев.'
+    )
 
     objects = PostQuerySet.as_manager()
     published = PublishedPostManager()
@@ -147,11 +175,36 @@ class Post(BaseModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['pub_date'],
+                condition=models.Q(is_published=True),
+                name='post_feed_pub_date_idx'
+            ),
+            models.Index(
+                fields=['category', 'pub_date'],
+                condition=models.Q(is_published=True),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         """Returns the post title."""
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Stores the excerpt of the text unless the text is deferred."""
+        if 'text' not in self.get_deferred_fields():
+            self.excerpt = make_excerpt(self.text)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Comment model."""
@@ -171,7 +224,81 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_at_idx'
+            ),
+        ]
 
     def __str__(self):
         """Returns the comment text."""
         return self.text
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the post the comment was loaded with."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_post_id = instance.__dict__.get('post_id')
+        return instance
+
+
+class ImageJob(models.Model):
+    """Background processing job of the uploaded post image."""
+
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (PROCESSING, 'Обрабатывается'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='image_jobs'
+    )
+    image = models.CharField(
+        max_length=settings.MAX_LENGTH,
+        verbose_name='Изображение'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начало обработки'
+    )
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('pk',)
+        indexes = [
+            models.Index(
+                fields=['status', 'id'],
+                name='imagejob_status_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """Returns the image name and the job status."""
+        return f'{self.image} ({self.get_status_display()})'
@@ -0,0 +1,225 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from blogicum.metrics import count_cache
+
+from .cache import get_generation, make_key
+
+NEXT = 'n'
+PREVIOUS = 'p'
+# Range of the 64-bit integer columns, larger ints overflow the drivers.
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+
+class InvalidCursor(InvalidPage):
+    """The cursor could not be decoded."""
+
+    pass
+
+
+def encode_cursor(values, direction):
+    """Packs the key values of a row into an opaque URL-safe string."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps([direction, payload], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """Unpacks the cursor made by encode_cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor('Некорректный курсор')
+    if (
+        direction not in (NEXT, PREVIOUS)
+        or not isinstance(values, list)
+        or len(values) != length
+    ):
+        raise InvalidCursor('Некорректный курсор')
+    return direction, values
+
+
+class KeysetPage(Sequence):
+    """Page of the KeysetPaginator, compatible with templates using Page."""
+
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginates the queryset by seeking on the ordering key instead of
+    using OFFSET, so every page costs the same and no COUNT is needed.
+    All ordering fields must share the same direction, the last one
+    must be unique.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-pk')):
+        descending = {field.startswith('-') for field in ordering}
+        if len(descending) != 1:
+            raise ValueError('Ordering fields must share the same direction.')
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.descending = descending.pop()
+        self.fields = tuple(field.lstrip('-') for field in ordering)
+
+    def _seek(self, values, forward):
+        """Builds the row comparison (a, b) < (x, y) as OR of ANDs."""
+        lookup = 'lt' if forward == self.descending else 'gt'
+        conditions = []
+        for index, field in enumerate(self.fields):
+            equal = dict(zip(self.fields[:index], values[:index]))
+            equal[f'{field}__{lookup}'] = values[index]
+            conditions.append(Q(**equal))
+        return reduce(or_, conditions)
+
+    def _parse(self, values):
+        """
+        Converts the cursor values with their model fields, raises
+        InvalidCursor for values the fields or the database cannot take.
+        """
+        opts = self.object_list.model._meta
+        parsed = []
+        for name, value in zip(self.fields, values):
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+            try:
+                value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError, OverflowError):
+                raise InvalidCursor('Некорректный курсор')
+            if (
+                value is None
+                or isinstance(value, datetime) and timezone.is_naive(value)
+                or isinstance(value, int) and not MIN_INT <= value <= MAX_INT
+            ):
+                raise InvalidCursor('Некорректный курсор')
+            parsed.append(value)
+        return parsed
+
+    def _key(self, obj):
+        return [getattr(obj, field) for field in self.fields]
+
+    def page(self, cursor=None):
+        """Returns the page that starts after (or ends before) the cursor."""
+        direction, values = (
+            decode_cursor(cursor, len(self.fields)) if cursor
+            else (NEXT, None)
+        )
+        if values is not None:
+            values = self._parse(values)
+        forward = direction == NEXT
+        queryset = self.object_list.order_by(*(
+            self.ordering if forward
+            else [field.lstrip('-') if self.descending else f'-{field}'
+                  for field in self.ordering]
+        ))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, self, None, None)
+        more_after = has_more if forward else True
+        more_before = values is not None if forward else has_more
+        return KeysetPage(
+            rows,
+            self,
+            encode_cursor(self._key(rows[-1]), NEXT) if more_after else None,
+            encode_cursor(self._key(rows[0]), PREVIOUS)
+            if more_before else None,
+        )
+
+
+def estimate_count(queryset):
+    """
+    Returns the row count estimated by the query planner, or None if the
+    database cannot estimate it cheaply.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Uses the planner estimate instead of COUNT(*) for very large results."""
+
+    @cached_property
+    def count(self):
+        count = estimate_count(self.object_list)
+        if count is None or count < settings.POSTS_COUNT_ESTIMATE_THRESHOLD:
+            count = super().count
+        return count
+
+
+class CachedCountPaginator(EstimatedCountPaginator):
+    """Keeps the total count in the cache under count_key for a short time."""
+
+    def __init__(self, *args, count_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        key = make_key(
+            'posts_count', get_generation('posts_count'), *self.count_key
+        )
+        count = cache.get(key)
+        count_cache('posts_count', *((0, 1) if count is None else (1, 0)))
+        if count is None:
+            count = super().count
+            cache.set(key, count, settings.POSTS_COUNT_CACHE_TIMEOUT)
+        return count
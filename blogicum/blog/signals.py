@@ -0,0 +1,184 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from .jobs import enqueue_image_job
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+_local = threading.local()
+
+
+def change_comment_count(post_id, delta):
+    """Atomically shifts the stored comment counter of the post."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw, **kwargs):
+    """
+    Remembers the post the comment belonged to before saving, so that
+    moving the comment to another post keeps both counters correct.
+    Queries the database only if the comment was not loaded from it.
+    """
+    if raw or instance._state.adding:
+        return
+    instance._previous_post_id = getattr(instance, '_loaded_post_id', None)
+    if instance._previous_post_id is None:
+        instance._previous_post_id = (
+            Comment.objects.filter(pk=instance.pk)
+            .values_list('post_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw, **kwargs):
+    """Increments the counter of the post when a comment is added."""
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif (
+        previous_post_id is not None
+        and previous_post_id != instance.post_id
+    ):
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+    instance._loaded_post_id = instance.post_id
+
+
+def get_deleting_posts():
+    """
+    Returns the ids of the posts being deleted in this thread mapped to
+    the on_commit hooks removing their marks.
+    """
+    if not hasattr(_local, 'deleting_posts'):
+        _local.deleting_posts = {}
+    return _local.deleting_posts
+
+
+def is_deleting_post(post_id, using):
+    """
+    Whether the post is being deleted by an unfinished transaction.
+    Django drops the pending on_commit hooks of a rolled back transaction
+    or savepoint, so the mark of a failed delete expires with its hook.
+    """
+    unmark = get_deleting_posts().get(post_id)
+    return unmark is not None and any(
+        hook[1] is unmark for hook in connections[using].run_on_commit
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def mark_deleting_post(sender, instance, using, **kwargs):
+    """
+    Marks the post as being deleted. Its comments are deleted before it,
+    and their counter updates would be wasted.
+    """
+    if not connections[using].in_atomic_block:
+        return
+    deleting = get_deleting_posts()
+    for post_id in [
+        post_id for post_id in deleting
+        if not is_deleting_post(post_id, using)
+    ]:
+        del deleting[post_id]
+
+    def unmark():
+        if deleting.get(instance.pk) is unmark:
+            del deleting[instance.pk]
+
+    deleting[instance.pk] = unmark
+    transaction.on_commit(unmark, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def unmark_deleting_post(sender, instance, **kwargs):
+    get_deleting_posts().pop(instance.pk, None)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, using, **kwargs):
+    """
+    Decrements the counter of the post when a comment is deleted.
+    Also fires for every comment removed by a bulk queryset delete, but
+    skips the comments deleted along with their post.
+    """
+    if not is_deleting_post(instance.post_id, using):
+        change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_posts_count(sender, **kwargs):
+    """Drops the cached totals of the post lists."""
+    bump_generation('posts_count')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def reset_post_pages(sender, instance, **kwargs):
+    """Drops the cached post lists, the cached page and card of the post."""
+    post_id = instance.pk if sender is Post else instance.post_id
+    bump_generation('feed', 'list_pages', f'post:{post_id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reset_all_pages(sender, **kwargs):
+    """Drops all cached post lists, post pages and post cards."""
+    bump_generation('feed', 'list_pages', 'posts')
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    """Remembers the username the user was loaded or created with."""
+    instance._loaded_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def reset_author_pages(sender, instance, created, raw, update_fields,
+                       **kwargs):
+    """
+    Drops the cached posts showing the author name when the username
+    changes, but not on registration, login or password change.
+    """
+    if raw or (update_fields and 'username' not in update_fields):
+        return
+    renamed = instance._loaded_username != instance.username
+    instance._loaded_username = instance.username
+    if renamed and not created:
+        bump_generation('feed', 'list_pages', 'posts')
+
+
+@receiver(pre_save, sender=Post)
+def detect_image_upload(sender, instance, raw, **kwargs):
+    """Notes that a new image file is about to be stored for the post."""
+    instance._image_uploaded = (
+        not raw and bool(instance.image) and not instance.image._committed
+    )
+
+
+@receiver(post_save, sender=Post)
+def queue_image_processing(sender, instance, **kwargs):
+    """Queues the background processing of the uploaded post image."""
+    if getattr(instance, '_image_uploaded', False):
+        instance._image_uploaded = False
+        enqueue_image_job(instance)
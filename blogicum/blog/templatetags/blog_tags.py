@@ -0,0 +1,107 @@
+from urllib.parse import quote
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_generations, make_key
+from blog.images import get_rendition_urls
+from blogicum.metrics import count_cache
+
+register = template.Library()
+
+# URL names of the post card links: name -> argument fitting the pattern
+POST_CARD_URLS = {
+    'profile_url': ('blog:profile', 'username'),
+    'detail_url': ('blog:post_detail', 999999999),
+    'category_url': ('blog:category_posts', 'slug'),
+}
+
+
+def url_builder(viewname, placeholder):
+    """
+    Reverses the URL once with the placeholder argument and returns
+    the function building the URL for any other argument.
+    """
+    prefix, suffix = reverse(viewname, args=[placeholder]).rsplit(
+        str(placeholder), 1
+    )
+    return lambda value: prefix + quote(
+        str(value), safe=RFC3986_SUBDELIMS + '/~:@'
+    ) + suffix
+
+
+def render_post_cards(posts):
+    """
+    Renders "includes/post_card.html" for every post in one pass. The
+    fragments cached by any post list, until the post, its comments,
+    categories or locations change, are fetched in one round trip, the
+    rest are rendered with one template and one reversal per URL name.
+    """
+    posts = list(posts)
+    if not posts:
+        return []
+    posts_generation, *generations = get_generations(
+        'posts', *(f'post:{post.pk}' for post in posts)
+    )
+    keys = [
+        make_key('post_card', posts_generation, generation, post.pk)
+        for post, generation in zip(posts, generations)
+    ]
+    cards = cache.get_many(keys)
+    missing = [(key, post) for key, post in zip(keys, posts)
+               if key not in cards]
+    count_cache('post_card', len(cards), len(missing))
+    if missing:
+        card_template = get_template('includes/post_card.html')
+        urls = {
+            name: url_builder(*pattern)
+            for name, pattern in POST_CARD_URLS.items()
+        }
+        rendered = {
+            key: card_template.render({
+                'post': post,
+                'profile_url': urls['profile_url'](post.author.username),
+                'detail_url': urls['detail_url'](post.pk),
+                'category_url': urls['category_url'](post.category.slug),
+            })
+            for key, post in missing
+        }
+        cache.set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [mark_safe(cards[key]) for key in keys]
+
+
+@register.inclusion_tag('includes/post_feed.html')
+def post_feed(posts):
+    """Renders the cards of a page of posts, see render_post_cards()."""
+    return {'cards': render_post_cards(posts)}
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, rendition, alt=''):
+    """
+    Renders the post image as the rendition with srcset of all JPEG and
+    WebP renditions, falling back to the original image.
+    """
+    urls = get_rendition_urls(post.image.name, post.image.storage)
+
+    def srcset(image_format):
+        return ', '.join(
+            f'{urls[name]} {width}w'
+            for name, (width, rendition_format)
+            in settings.POST_IMAGE_RENDITIONS.items()
+            if rendition_format == image_format and name in urls
+        )
+
+    return {
+        'original_url': post.image.url,
+        'src': urls.get(rendition, post.image.url),
+        'srcset': srcset('JPEG'),
+        'webp_srcset': srcset('WEBP'),
+        'alt': alt,
+    }
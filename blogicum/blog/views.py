@@ -1,14 +1,26 @@
+from datetime import timedelta
+from http import HTTPStatus
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils import timezone
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 
+from blogicum.metrics import IMAGE_UPLOAD_BYTES, WRITES, count_cache
+
+from .cache import (get_generation, get_generations, make_key,
+                    make_page_key)
 from .forms import CommentForm, PostForm, UserUpdateForm
-from .models import Category, Comment, Post
+from .models import Category, Comment, Post, published_now
+from .paginators import CachedCountPaginator, KeysetPaginator
 
 User = get_user_model()
 
@@ -33,27 +45,40 @@ class CommentMixin:
         )
 
 
-class CommentDispatchMixin:
-    """Adds pk_url_kwarg attribute and modified method dispatch."""
-
-    pk_url_kwarg = 'comment_pk'
+class OwnerDispatchMixin:
+    """
+    Gets the object once in dispatch, compares its author_id with the
+    request user and reuses it in get_object.
+    """
 
     def dispatch(self, request, *args, **kwargs):
         """
-        Gets the correct comment, or raises 404 error
-        if the comment does not exist.
-        Redirects to the post page if comment author is not equal to the
+        Gets the correct object, or raises 404 error if the object does not
+        exist.
+        Redirects to the post page if object author is not equal to the
         request user.
         """
-        comment = get_object_or_404(Comment, pk=kwargs[self.pk_url_kwarg])
-        if comment.author != request.user:
+        self.owned_object = get_object_or_404(
+            self.model, pk=kwargs[self.pk_url_kwarg]
+        )
+        if self.owned_object.author_id != request.user.pk:
             return redirect(
                 'blog:post_detail', post_pk=kwargs['post_pk']
             )
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        """Returns the object fetched in dispatch."""
+        return self.owned_object
+
+
+class CommentDispatchMixin(OwnerDispatchMixin):
+    """Adds pk_url_kwarg attribute and modified method dispatch."""
+
+    pk_url_kwarg = 'comment_pk'
 
-class PostDispatchMixin:
+
+class PostDispatchMixin(OwnerDispatchMixin):
     """
     Adds model, form_class, template_name, pk_url_kwarg attributes and
     modified method dispatch.
@@ -64,39 +89,165 @@ class PostDispatchMixin:
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_pk'
 
+
+class AnonymousPageCacheMixin:
+    """
+    Caches the rendered page for unauthenticated users for
+    PAGE_CACHE_TIMEOUT seconds, until the generations from
+    get_page_cache_key change.
+    """
+
+    def get_page_cache_key(self):
+        """Returns the parts of the page cache key besides the URL."""
+        return (
+            get_generation('list_pages'), int(published_now().timestamp())
+        )
+
     def dispatch(self, request, *args, **kwargs):
-        """
-        Gets the correct post, or raise 404 error if the post does not exist.
-        Redirects to the post page if post author is not equal to the
-        request user.
-        """
-        post = get_object_or_404(Post, pk=kwargs[self.pk_url_kwarg])
-        if post.author != self.request.user:
-            return redirect(
-                'blog:post_detail',
-                post_pk=kwargs[self.pk_url_kwarg]
+        """Returns the cached page or renders and caches it."""
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = make_page_key(request, *self.get_page_cache_key())
+        response = cache.get(key)
+        if response is not None:
+            count_cache('page', 1)
+            return response
+        count_cache('page', 0, 1)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, rendered, settings.PAGE_CACHE_TIMEOUT
+                )
             )
-        return super().dispatch(request, *args, **kwargs)
+        return response
+
+
+class WriteMetricsMixin:
+    """
+    Counts the posts and comments written by the view with the
+    write_action in the metrics, along with the sizes of the uploaded
+    images.
+    """
+
+    write_action = None
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        WRITES.inc(model=self.model._meta.model_name, action=self.write_action)
+        for upload in self.request.FILES.values():
+            IMAGE_UPLOAD_BYTES.observe(upload.size)
+        return response
+
+    def delete(self, request, *args, **kwargs):
+        response = super().delete(request, *args, **kwargs)
+        WRITES.inc(model=self.model._meta.model_name, action=self.write_action)
+        return response
 
 
 class PaginateMixin:
-    """Adds model and paginate_by attributes"""
+    """
+    Adds model and paginate_by attributes.
+    Switches to cursor pagination on (pub_date, id) if keyset_pagination
+    is enabled.
+    """
 
     model = Post
     paginate_by = settings.POSTS_ON_PAGE
+    paginator_class = CachedCountPaginator
+    keyset_pagination = settings.KEYSET_PAGINATION
+    cursor_kwarg = 'cursor'
+
+    def get_list_key(self):
+        """Returns the parts of the cache keys of the post list."""
+        return (type(self).__name__,)
+
+    def get_paginator(self, *args, **kwargs):
+        """
+        Passes the count cache key to the paginator, the count changes when
+        scheduled posts are published, so the key includes the time bucket.
+        """
+        return super().get_paginator(
+            *args,
+            count_key=(
+                *self.get_list_key(), int(published_now().timestamp())
+            ),
+            **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Returns the page located by the opaque cursor from the request,
+        or raises 404 error if the cursor is invalid.
+        In the page number mode keeps the posts of the page in the cache
+        until the end of the current published_now() bucket.
+        The cards show the stored excerpt, so the text is not loaded.
+        """
+        queryset = queryset.defer('text')
+        if not self.keyset_pagination:
+            paginator, page, posts, is_paginated = (
+                super().paginate_queryset(queryset, page_size)
+            )
+            now = published_now()
+            key = make_key(
+                'feed', get_generation('feed'), int(now.timestamp()),
+                *self.get_list_key(), page.number
+            )
+            page.object_list = cache.get(key)
+            count_cache('feed', *(
+                (0, 1) if page.object_list is None else (1, 0)
+            ))
+            if page.object_list is None:
+                page.object_list = list(posts)
+                bucket_end = now + timedelta(
+                    seconds=settings.PUBLISHED_NOW_BUCKET
+                )
+                cache.set(key, page.object_list, max(
+                    (bucket_end - timezone.now()).total_seconds(), 1
+                ))
+            return paginator, page, page.object_list, is_paginated
+        paginator = KeysetPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        """
+        Adds the page numbers around the current page, elided so that
+        the paginator shows about NUMBER_OF_PAGINATOR_PAGES links.
+        """
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        if page is not None and not getattr(page, 'is_keyset', False):
+            context['page_range'] = list(
+                page.paginator.get_elided_page_range(
+                    page.number,
+                    on_each_side=(settings.NUMBER_OF_PAGINATOR_PAGES - 1) // 2,
+                    on_ends=1,
+                )
+            )
+        return context
 
 
-class HomepageListView(PaginateMixin, ListView):
+class HomepageListView(AnonymousPageCacheMixin, PaginateMixin, ListView):
     """
     Displays homepage with all posts, based on the "index.html"
     template.
     """
 
     template_name = 'blog/index.html'
-    queryset = Post.published.all()
+
+    def get_queryset(self):
+        """
+        Returns the published posts, built per request so that the
+        publication time bound is not frozen at import time.
+        """
+        return Post.published.all()
 
 
-class CategoryListView(PaginateMixin, ListView):
+class CategoryListView(AnonymousPageCacheMixin, PaginateMixin, ListView):
     """
     Displays posts under specific category, using the "category.html"
     template.
@@ -114,7 +265,11 @@ class CategoryListView(PaginateMixin, ListView):
         category = get_object_or_404(
             Category, slug=self.kwargs[self.slug_url_kwarg], is_published=True
         )
-        return category.posts.published()
+        return category.posts.with_related_data().published()
+
+    def get_list_key(self):
+        """Adds the category slug to the cache keys of the post list."""
+        return super().get_list_key() + (self.kwargs[self.slug_url_kwarg],)
 
     def get_context_data(self, **kwargs):
         """Adds information about the category to the context."""
@@ -168,7 +323,17 @@ class ProfileListView(PaginateMixin, ListView):
         )
         if self.request.user == author:
             return author.posts.with_related_data()
-        return author.posts.published()
+        return author.posts.with_related_data().published()
+
+    def get_list_key(self):
+        """
+        Adds the author and the kind of the post list to the cache keys,
+        since the author also sees unpublished posts.
+        """
+        username = self.kwargs[self.user_url_kwarg]
+        return super().get_list_key() + (
+            username, self.request.user.get_username() == username
+        )
 
     def get_context_data(self, **kwargs):
         """Adds information about the user to the context."""
@@ -179,12 +344,13 @@ class ProfileListView(PaginateMixin, ListView):
         return context
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, WriteMetricsMixin, CreateView):
     """Displays PostForm based on "create.html" template."""
 
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
+    write_action = 'create'
 
     def form_valid(self, form):
         """Adds the author to the form."""
@@ -202,40 +368,94 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostDetailView(DetailView):
-    """Displays correct post based on "detail.html" template."""
+class PostCommentsMixin:
+    """
+    Adds model and pk_url_kwarg attributes, gets the post hiding
+    unpublished posts from everyone except the author and adds the page
+    of post comments to the context.
+    """
 
     model = Post
-    template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_pk'
 
-    def dispatch(self, request, *args, **kwargs):
+    def get_queryset(self):
+        """Joins the author, location and category of the post."""
+        return Post.objects.select_related('author', 'location', 'category')
+
+    def get_object(self, queryset=None):
         """
         Gets the correct post, or raises 404 error if the post does not exist.
         Raises 404 error if post author is not equal to the request user and
         post is not published.
         """
-        post = get_object_or_404(Post, pk=kwargs[self.pk_url_kwarg])
-        if post.is_published is False and request.user != post.author:
+        post = super().get_object(queryset)
+        if not post.is_published and post.author != self.request.user:
             raise Http404
-        return super().dispatch(request, *args, **kwargs)
+        return post
+
+    def get_page_cache_key(self):
+        """
+        Keys the page on the generation of the post, so only changes of
+        this post and its comments drop it.
+        """
+        return get_generations(
+            'posts', f'post:{self.kwargs[self.pk_url_kwarg]}'
+        )
+
+    def get_comments_page(self):
+        """
+        Returns the page of the post comments after the cursor from the
+        request, or raises 404 error if the cursor is invalid.
+        """
+        paginator = KeysetPaginator(
+            self.object.comments.select_related('author'),
+            settings.COMMENTS_ON_PAGE,
+            ordering=('created_at', 'pk'),
+        )
+        try:
+            return paginator.page(self.request.GET.get('cursor'))
+        except InvalidPage as error:
+            raise Http404(str(error))
 
     def get_context_data(self, **kwargs):
-        """Adds the CommentForm and post comments to the context."""
+        """Adds the page of post comments to the context."""
+        context = super().get_context_data(**kwargs)
+        context['comments_page'] = self.get_comments_page()
+        context['comments'] = context['comments_page'].object_list
+        return context
+
+
+class PostDetailView(PostCommentsMixin, AnonymousPageCacheMixin, DetailView):
+    """Displays correct post based on "detail.html" template."""
+
+    template_name = 'blog/detail.html'
+
+    def get_context_data(self, **kwargs):
+        """Adds the CommentForm to the context."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
-        )
         return context
 
 
-class PostUpdateView(PostDispatchMixin, LoginRequiredMixin, UpdateView):
+class PostCommentsView(PostCommentsMixin, AnonymousPageCacheMixin, DetailView):
+    """
+    Displays the next page of post comments as an HTML fragment, based on
+    "comment_list.html" template.
+    """
+
+    template_name = 'includes/comment_list.html'
+
+
+class PostUpdateView(
+    PostDispatchMixin, LoginRequiredMixin, WriteMetricsMixin, UpdateView
+):
     """
     Displays PostForm with post instance based on the "create.html"
     template.
     """
 
+    write_action = 'update'
+
     def get_success_url(self):
         """
         Determines the URL for redirect to the correct post when the
@@ -248,14 +468,17 @@ class PostUpdateView(PostDispatchMixin, LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDeleteView(PostDispatchMixin, LoginRequiredMixin, DeleteView):
+class PostDeleteView(
+    PostDispatchMixin, LoginRequiredMixin, WriteMetricsMixin, DeleteView
+):
     """CBV that displays post information based on "create.html" template."""
 
+    write_action = 'delete'
+
     def get_context_data(self, **kwargs):
         """Adds the PostForm with related instance to the context."""
         context = super().get_context_data(**kwargs)
-        instance = Post.objects.get(pk=self.kwargs[self.pk_url_kwarg])
-        context['form'] = PostForm(instance=instance)
+        context['form'] = PostForm(instance=self.object)
         return context
 
     def get_success_url(self):
@@ -269,11 +492,20 @@ class PostDeleteView(PostDispatchMixin, LoginRequiredMixin, DeleteView):
         )
 
 
-class CommentCreateView(CommentMixin, LoginRequiredMixin, CreateView):
+class CommentCreateView(
+    CommentMixin, LoginRequiredMixin, WriteMetricsMixin, CreateView
+):
     """Displays CommentForm based on "comment.html" template."""
 
+    write_action = 'create'
+
+    @transaction.atomic
     def form_valid(self, form):
-        """Adds the author and post to the form."""
+        """
+        Adds the author and post to the form.
+        Saves the comment and updates the comment counter of the post
+        in one transaction.
+        """
         post = get_object_or_404(Post, pk=self.kwargs['post_pk'])
         form.instance.author = self.request.user
         form.instance.post = post
@@ -281,19 +513,29 @@ class CommentCreateView(CommentMixin, LoginRequiredMixin, CreateView):
 
 
 class CommentDeleteView(
-    CommentMixin, CommentDispatchMixin, LoginRequiredMixin, DeleteView
+    CommentMixin, CommentDispatchMixin, LoginRequiredMixin,
+    WriteMetricsMixin, DeleteView
 ):
     """Displays comment information based on "comment.html" template."""
 
-    pass
+    write_action = 'delete'
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        """
+        Deletes the comment and updates the comment counter of the post
+        in one transaction.
+        """
+        return super().delete(request, *args, **kwargs)
 
 
 class CommentUpdateView(
-    CommentMixin, CommentDispatchMixin, LoginRequiredMixin, UpdateView
+    CommentMixin, CommentDispatchMixin, LoginRequiredMixin,
+    WriteMetricsMixin, UpdateView
 ):
     """
     Displays CommentForm with comment instance based on "comment.html"
     template.
     """
 
-    pass
+    write_action = 'update'
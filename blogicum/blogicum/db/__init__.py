@@ -0,0 +1,17 @@
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    """
+    Closes the persistent connections that the database server has
+    dropped, so the request opens a new one instead of failing on the
+    first query. Enabled by CONN_HEALTH_CHECKS of the database.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
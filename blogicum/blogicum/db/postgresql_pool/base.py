@@ -0,0 +1,120 @@
+import threading
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """
+    Thread-safe pool making getconn() wait up to timeout seconds for a
+    free connection when all maxconn are in use, instead of failing at
+    once as ThreadedConnectionPool does.
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout=30, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.slots = threading.BoundedSemaphore(maxconn)
+        self.timeout = timeout
+
+    def getconn(self, key=None):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise PoolError('connection pool exhausted')
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        super().putconn(conn, key, close)
+        self.slots.release()
+
+
+def get_pool(alias, pool_settings, conn_params):
+    """Returns the connection pool of the database, creating it once."""
+    with pools_lock:
+        if alias not in pools:
+            pools[alias] = BlockingConnectionPool(
+                pool_settings.get('MIN_SIZE', 1),
+                pool_settings.get('MAX_SIZE', 10),
+                timeout=pool_settings.get('TIMEOUT', 30),
+                **conn_params
+            )
+        return pools[alias]
+
+
+def is_alive(connection):
+    """
+    Whether the idle pooled connection still works. Rolls back the probe,
+    since without autocommit it opens a transaction, and Django cannot
+    set up the session of a connection inside one.
+    """
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except psycopg2.Error:
+        return False
+    return connection.info.transaction_status == TRANSACTION_STATUS_IDLE
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend taking connections from an in-process pool of the
+    worker instead of opening one per request. The pool size and the
+    seconds to wait for a free connection are set by
+    POOL = {'MIN_SIZE': ..., 'MAX_SIZE': ..., 'TIMEOUT': ...} of the
+    database settings.
+    """
+
+    def get_pool(self, conn_params=None):
+        return get_pool(
+            self.alias,
+            self.settings_dict.get('POOL', {}),
+            conn_params or self.get_connection_params(),
+        )
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        # All idle connections may be broken, e.g. after a server restart,
+        # so check the replacements too, up to a newly opened one.
+        for _ in range(pool.maxconn + 1):
+            connection = pool.getconn()
+            if not self.settings_dict.get('CONN_HEALTH_CHECKS') or is_alive(
+                connection
+            ):
+                break
+            pool.putconn(connection, close=True)
+        else:
+            raise psycopg2.OperationalError(
+                'no working connection in the pool'
+            )
+        options = self.settings_dict['OPTIONS']
+        if 'isolation_level' in options:
+            self.isolation_level = options['isolation_level']
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        else:
+            self.isolation_level = connection.isolation_level
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        """Returns the connection to the pool, broken ones are dropped."""
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            self.get_pool().putconn(
+                self.connection,
+                close=self.connection.closed or self.errors_occurred,
+            )
@@ -0,0 +1,20 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend applying PRAGMAS of the database settings to every new
+    connection. With TRANSACTION_MODE = 'IMMEDIATE' transactions take the
+    write lock when they begin, so concurrent writers wait for it up to
+    busy_timeout instead of failing with "database is locked" when a read
+    transaction cannot be upgraded to a write one.
+    """
+
+    def init_connection_state(self):
+        super().init_connection_state()
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            self.connection.execute(f'PRAGMA {name} = {value}')
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -0,0 +1,271 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+UNRESOLVED = '<unresolved>'
+
+
+class Registry:
+    """
+    In-process store of counters and histograms, exposed in the
+    Prometheus text format.
+    With METRICS_DIR set every process writes its values to its own file
+    in that directory at most every METRICS_FLUSH_INTERVAL seconds and at
+    exit, and collect() sums the files of all processes, so pre-fork
+    workers report the totals of the whole server.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.reset()
+        os.register_at_fork(after_in_child=self.reset)
+        atexit.register(self.flush, force=True)
+
+    def reset(self):
+        """Drops the values, e.g. inherited by a forked worker."""
+        self.values = {}
+        self.last_flush = 0
+        self.file_name = f'{os.getpid()}-{time.time_ns()}.json'
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add(self, name, labels, amounts):
+        """Adds the amounts to the values of the metric with the labels."""
+        with self.lock:
+            values = self.values.setdefault(name, {})
+            current = values.get(labels)
+            values[labels] = (
+                list(amounts) if current is None
+                else [old + new for old, new in zip(current, amounts)]
+            )
+
+    def dump(self):
+        with self.lock:
+            return {
+                name: [[list(labels), amounts]
+                       for labels, amounts in values.items()]
+                for name, values in self.values.items()
+            }
+
+    def flush(self, force=False):
+        """Writes the values of this process to its file in METRICS_DIR."""
+        now = time.monotonic()
+        if not settings.METRICS_DIR or not self.values or (
+            not force
+            and now - self.last_flush < settings.METRICS_FLUSH_INTERVAL
+        ):
+            return
+        self.last_flush = now
+        path = Path(settings.METRICS_DIR) / self.file_name
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.dump()))
+        os.replace(temporary, path)
+
+    def collect(self):
+        """Returns the values of all processes summed by metric and labels."""
+        if not settings.METRICS_DIR:
+            dumps = [self.dump()]
+        else:
+            self.flush(force=True)
+            dumps = []
+            for path in Path(settings.METRICS_DIR).glob('*.json'):
+                try:
+                    dumps.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+        totals = {}
+        for dump in dumps:
+            for name, samples in dump.items():
+                values = totals.setdefault(name, {})
+                for labels, amounts in samples:
+                    labels = tuple(tuple(pair) for pair in labels)
+                    current = values.get(labels)
+                    values[labels] = (
+                        amounts if current is None
+                        else [old + new for old, new in zip(current, amounts)]
+                    )
+        return totals
+
+    def expose(self):
+        """Returns the metrics of all processes in the text format."""
+        totals = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for labels, amounts in sorted(totals.get(name, {}).items()):
+                lines.extend(metric.samples(labels, amounts))
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\')
+                         .replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Named metric of the registry with a fixed set of label names."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def label_values(self, labels):
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.name, self.label_values(labels), [amount])
+
+    def samples(self, labels, amounts):
+        yield f'{self.name}{format_labels(labels)} {format_value(amounts[0])}'
+
+
+class Histogram(Metric):
+    """Histogram keeping cumulative bucket counts, the sum and the count."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=(),
+                 registry=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = (*buckets, math.inf)
+
+    def observe(self, value, **labels):
+        self.registry.add(
+            self.name, self.label_values(labels),
+            [int(value <= bound) for bound in self.buckets] + [value, 1]
+        )
+
+    def samples(self, labels, amounts):
+        *counts, total, count = amounts
+        for bound, bucket_count in zip(self.buckets, counts):
+            bucket_labels = (*labels, ('le', format_value(bound)))
+            yield (
+                f'{self.name}_bucket{format_labels(bucket_labels)} '
+                f'{bucket_count}'
+            )
+        yield f'{self.name}_sum{format_labels(labels)} {format_value(total)}'
+        yield f'{self.name}_count{format_labels(labels)} {count}'
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = Histogram(
+    'blogicum_request_duration_seconds',
+    'Request latency by view name.',
+    ('view', 'method', 'status'),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'blogicum_request_queries',
+    'Database queries per request by view name.',
+    ('view',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+REQUEST_SQL_DURATION = Histogram(
+    'blogicum_request_sql_duration_seconds',
+    'SQL time per request by view name, measured with REQUEST_TIMING.',
+    ('view',),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    'blogicum_cache_requests_total',
+    'Cache lookups by cached entry kind and result (hit or miss).',
+    ('cache', 'result'),
+)
+WRITES = Counter(
+    'blogicum_writes_total',
+    'Posts and comments created, updated and deleted.',
+    ('model', 'action'),
+)
+IMAGE_UPLOAD_BYTES = Histogram(
+    'blogicum_image_upload_bytes',
+    'Size of the uploaded post images.',
+    buckets=(
+        10 * 1024, 100 * 1024, 500 * 1024, 1024 ** 2, 5 * 1024 ** 2,
+        10 * 1024 ** 2,
+    ),
+)
+FILE_RESPONSES = Counter(
+    'blogicum_file_responses_total',
+    'Static and media file responses by status and content coding.',
+    ('kind', 'status', 'encoding'),
+)
+
+
+def count_cache(cache_name, hits, misses=0):
+    """Records the hits and misses of the cache lookups."""
+    if hits:
+        CACHE_REQUESTS.inc(hits, cache=cache_name, result='hit')
+    if misses:
+        CACHE_REQUESTS.inc(misses, cache=cache_name, result='miss')
+
+
+class QueryCounter:
+    """Execute wrapper counting the SQL queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency and the query count of every request by the URL
+    name of its view and flushes the metrics of the process.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED
+        REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            view=view, method=request.method, status=response.status_code,
+        )
+        REQUEST_QUERIES.observe(counter.count, view=view)
+        REGISTRY.flush()
+        return response
@@ -0,0 +1,100 @@
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('blogicum.nplusone')
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+_local = threading.local()
+
+
+class NPlusOneError(Exception):
+    """The request ran a query of the same shape too many times."""
+
+    pass
+
+
+def query_shape(sql):
+    """
+    Returns the SQL with the IN lists collapsed, so queries differing only
+    in the parameters or the number of IN values have the same shape.
+    """
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+@contextmanager
+def allow_repeated_queries():
+    """
+    Excludes the queries run inside the block, or the decorated function,
+    from the N+1 detection.
+    """
+    _local.allowed = getattr(_local, 'allowed', 0) + 1
+    try:
+        yield
+    finally:
+        _local.allowed -= 1
+
+
+class QueryShapeCounter:
+    """Execute wrapper counting the queries by shape."""
+
+    def __init__(self):
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not getattr(_local, 'allowed', 0):
+            self.shapes[query_shape(sql)] += 1
+        return execute(sql, params, many, context)
+
+
+class NPlusOneMiddleware:
+    """
+    Detects queries of the same shape run NPLUSONE_THRESHOLD or more times
+    in one request, usually a related object loaded per row of a list
+    without select_related or prefetch_related. Depending on NPLUSONE_MODE
+    logs a warning ('log') or raises NPlusOneError ('raise'). Queries
+    matching NPLUSONE_WHITELIST or run in allow_repeated_queries() are
+    not counted.
+    """
+
+    def __init__(self, get_response):
+        if not settings.NPLUSONE_MODE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.whitelist = [
+            re.compile(pattern) for pattern in settings.NPLUSONE_WHITELIST
+        ]
+
+    def __call__(self, request):
+        counter = QueryShapeCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        repeated = [
+            (count, shape)
+            for shape, count in counter.shapes.most_common()
+            if count >= settings.NPLUSONE_THRESHOLD
+            and not any(pattern.search(shape) for pattern in self.whitelist)
+        ]
+        if repeated:
+            self.report(request, repeated)
+        return response
+
+    def report(self, request, repeated):
+        match = request.resolver_match
+        message = 'N+1 queries in {} {} ({}):\n{}'.format(
+            request.method, request.get_full_path(),
+            match.view_name if match else '<unresolved>',
+            '\n'.join(f'{count} x {shape}' for count, shape in repeated),
+        )
+        if settings.NPLUSONE_MODE == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogicum.timing.RequestTimingMiddleware',
+    'blogicum.metrics.MetricsMiddleware',
+    'blogicum.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +59,46 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# REQUEST_TIMING=1 adds the Server-Timing header to responses, logs the
+# requests slower than REQUEST_TIMING_SLOW_MS to the 'blogicum.timing'
+# logger and adds the SQL time to the metrics. `manage.py request_timings`
+# reads the metrics of all workers from METRICS_DIR.
+REQUEST_TIMING = os.getenv('REQUEST_TIMING') == '1'
+
+REQUEST_TIMING_SLOW_MS = int(os.getenv('REQUEST_TIMING_SLOW_MS', '500'))
+
+# /metrics exposes the counters and histograms of blogicum.metrics to the
+# clients sending "Authorization: Bearer <METRICS_TOKEN>" or connecting from
+# the METRICS_ALLOWED_IPS (comma-separated), it is closed if neither is set.
+# Behind a reverse proxy on the same host all clients come from 127.0.0.1,
+# so prefer the token there. With several worker processes set METRICS_DIR
+# to a directory shared by them and emptied when the server starts, every
+# worker writes its metrics there at most every METRICS_FLUSH_INTERVAL
+# seconds.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+METRICS_ALLOWED_IPS = [
+    address for address in os.getenv('METRICS_ALLOWED_IPS', '').split(',')
+    if address
+]
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+
+# NPLUSONE_MODE='log' warns on the 'blogicum.nplusone' logger about
+# queries of the same shape run NPLUSONE_THRESHOLD or more times in one
+# request, 'raise' raises NPlusOneError (as the tests do), '' disables the
+# check. NPLUSONE_WHITELIST holds regular expressions of the SQL allowed to
+# repeat, code can also be wrapped in blogicum.nplusone.allow_repeated_queries.
+NPLUSONE_MODE = os.getenv('NPLUSONE_MODE', 'log')
+
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', '3'))
+
+NPLUSONE_WHITELIST = [
+    r'^(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b',
+]
+
 ROOT_URLCONF = 'blogicum.urls'
 
 STATICFILES_DIRS = [
@@ -79,16 +123,63 @@ TEMPLATES = [
     },
 ]
 
+# Compile all templates of TEMPLATES_DIR when the WSGI worker starts.
+TEMPLATE_WARM_UP = False
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# DB_ENGINE may be 'django.db.backends.postgresql' or, to take connections
+# from an in-process pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections,
+# 'blogicum.db.postgresql_pool'; when all are in use a request waits up to
+# DB_POOL_TIMEOUT seconds for a free one. DB_CONN_MAX_AGE keeps connections open
+# between requests (seconds, 0 closes them after each request), and
+# DB_CONN_HEALTH_CHECKS=1 checks reused connections at request start.
+# The default SQLite backend applies PRAGMAS to every connection: WAL lets
+# readers work while a comment is written, busy_timeout (ms) makes writers
+# wait for the lock and IMMEDIATE transactions take it up front.
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': os.getenv('DB_ENGINE', 'blogicum.db.sqlite3'),
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS') == '1',
+        'POOL': {
+            'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        },
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': int(os.getenv('DB_SQLITE_BUSY_TIMEOUT', '5000')),
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+        },
+        'TRANSACTION_MODE': 'IMMEDIATE',
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Set CACHE_BACKEND and CACHE_LOCATION to use a cache shared by all workers,
+# e.g. django.core.cache.backends.memcached.PyMemcacheCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'blogicum'),
     }
 }
 
@@ -131,6 +222,28 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static_collected'
+
+# 'blogicum.storage.CompressedManifestStaticFilesStorage' in production,
+# the files are collected into STATIC_ROOT by `manage.py build_static`.
+STATICFILES_STORAGE = os.getenv(
+    'STATICFILES_STORAGE',
+    'django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+
+# Files with a content hash in the name never change.
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Django serves STATIC_ROOT only with DEBUG or SERVE_STATIC=1, otherwise
+# the front-end server is expected to serve it.
+SERVE_STATIC = os.getenv('SERVE_STATIC') == '1'
+
+# Third-party assets downloaded by `manage.py build_static` into
+# STATICFILES_DIRS: static path -> source of django-bootstrap5 settings.
+VENDORED_ASSETS = {
+    'vendor/bootstrap/bootstrap.min.css': 'css_url',
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -138,8 +251,25 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 POSTS_ON_PAGE = 10
 
+COMMENTS_ON_PAGE = 50
+
+KEYSET_PAGINATION = False
+
+PUBLISHED_NOW_BUCKET = 60
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+POSTS_COUNT_CACHE_TIMEOUT = 60
+
+POSTS_COUNT_ESTIMATE_THRESHOLD = 100_000
+
 MAX_LENGTH = 256
 
+# Number of words of Post.excerpt shown in post lists.
+POST_EXCERPT_WORDS = 10
+
 NUMBER_OF_PAGINATOR_PAGES = 10
 
 INTERNAL_IPS = [
@@ -150,6 +280,31 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
+# 'X-Accel-Redirect' (nginx) or 'X-Sendfile' (Apache, lighttpd) to let the
+# front-end server send media files; nginx serves them from
+# MEDIA_ACCEL_REDIRECT_PREFIX configured as an internal location.
+MEDIA_SENDFILE_HEADER = os.getenv('MEDIA_SENDFILE_HEADER', '')
+
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv(
+    'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/'
+)
+
+# Renditions of Post.image: name -> (max width, format)
+POST_IMAGE_RENDITIONS = {
+    'thumb': (640, 'JPEG'),
+    'detail': (1280, 'JPEG'),
+    'thumb_webp': (640, 'WEBP'),
+    'detail_webp': (1280, 'WEBP'),
+}
+
+POST_IMAGE_QUALITY = 80
+
+POST_IMAGE_JOB_MAX_ATTEMPTS = 3
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -0,0 +1,39 @@
+"""
+Production settings for blogicum project.
+
+Use with DJANGO_SETTINGS_MODULE=blogicum.settings_production.
+"""
+
+import os
+
+from .settings import *  # noqa: F401, F403
+from .settings import TEMPLATES
+
+SECRET_KEY = os.getenv('SECRET_KEY', SECRET_KEY)  # noqa: F405
+
+DEBUG = False
+
+# Templates are loaded and compiled once per worker process.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'debug': False,
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+TEMPLATE_WARM_UP = True
+
+STATICFILES_STORAGE = os.getenv(
+    'STATICFILES_STORAGE',
+    'blogicum.storage.CompressedManifestStaticFilesStorage'
+)
@@ -0,0 +1,55 @@
+import gzip
+import os
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.map', '.svg', '.ico', '.json', '.txt', '.xml', '.html',
+}
+
+# Encodings of the pre-compressed variants: name -> (suffix, compressor)
+PRECOMPRESSED = {
+    'br': ('.br', lambda content: brotli.compress(content, quality=11)),
+    'gzip': ('.gz', lambda content: gzip.compress(content, 9, mtime=0)),
+}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Stores static files under content-hashed names with a manifest and
+    writes brotli and gzip variants of the hashed text files next to
+    them, so the server can send them without compressing on the fly.
+    """
+
+    min_compress_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run=dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in set(hashed_names.values()):
+            self.compress(hashed_name)
+
+    def compress(self, name):
+        """Writes the variants of the file smaller than the original."""
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < self.min_compress_size:
+            return
+        for suffix, compressor in PRECOMPRESSED.values():
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
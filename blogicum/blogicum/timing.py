@@ -0,0 +1,96 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import REQUEST_SQL_DURATION, UNRESOLVED
+
+logger = logging.getLogger('blogicum.timing')
+
+
+class QueryRecorder:
+    """Execute wrapper collecting the duration of every SQL query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(((time.perf_counter() - start) * 1000, sql))
+
+
+class RequestTimingMiddleware:
+    """
+    Measures the query count, SQL, view and template render time of each
+    request, sends them in the Server-Timing header, logs requests slower
+    than REQUEST_TIMING_SLOW_MS with their slowest queries and adds the
+    SQL time to the metrics of the URL name. Enabled by REQUEST_TIMING.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.timing = {'start': time.perf_counter()}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.report(request, response, recorder.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing['view'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing['render'] = time.perf_counter()
+
+        def rendered(response):
+            timing['rendered'] = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def report(self, request, response, queries):
+        timing = request.timing
+        end = time.perf_counter()
+        total_ms = (end - timing['start']) * 1000
+        sql_ms = sum(duration for duration, _ in queries)
+        metrics = [
+            f'db;dur={sql_ms:.1f};desc="{len(queries)} queries"',
+        ]
+        if 'view' in timing:
+            view_end = timing.get('render', end)
+            metrics.append(
+                f'view;dur={(view_end - timing["view"]) * 1000:.1f}'
+            )
+        if 'rendered' in timing:
+            metrics.append(
+                'render;dur='
+                f'{(timing["rendered"] - timing["render"]) * 1000:.1f}'
+            )
+        metrics.append(f'total;dur={total_ms:.1f}')
+        response['Server-Timing'] = ', '.join(metrics)
+        match = request.resolver_match
+        name = match.view_name if match else UNRESOLVED
+        REQUEST_SQL_DURATION.observe(sql_ms / 1000, view=name)
+        if total_ms >= settings.REQUEST_TIMING_SLOW_MS:
+            slowest = sorted(queries, key=lambda query: -query[0])[:5]
+            logger.warning(
+                'Slow request %s %s (%s): %.1f ms, %d queries, %.1f ms SQL'
+                '\n%s',
+                request.method, request.get_full_path(), name, total_ms,
+                len(queries), sql_ms,
+                '\n'.join(f'{duration:.1f} ms: {sql}'
+                          for duration, sql in slowest),
+            )
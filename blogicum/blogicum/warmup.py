@@ -0,0 +1,32 @@
+import os
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def iter_template_names(directory):
+    """Yields the names of the templates under the directory."""
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith(TEMPLATE_EXTENSIONS):
+                path = os.path.join(root, file)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_up_templates():
+    """
+    Compiles every template of the DIRS of the Django template engines, so
+    the cached loader holds them before the first request. Returns the
+    number of compiled templates.
+    """
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.dirs:
+            for name in iter_template_names(directory):
+                engine.get_template(name)
+                compiled += 1
+    return compiled
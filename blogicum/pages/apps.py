@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class PagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pages'
+
+    def ready(self):
+        from blogicum.db import check_connections
+
+        request_started.connect(check_connections)
@@ -0,0 +1,100 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from blog.models import Post
+from blogicum.warmup import warm_up_templates
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def get_templates_settings(cached):
+    """Returns TEMPLATES with or without the cached loader."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for engine in templates:
+        options = engine.setdefault('OPTIONS', {})
+        options.pop('loaders', None)
+        engine['APP_DIRS'] = not cached
+        if cached:
+            options['loaders'] = CACHED_LOADERS
+    return templates
+
+
+class Command(BaseCommand):
+    """Measures the render time of the index page by template loaders."""
+
+    help = (
+        'Измеряет время отрисовки главной страницы без кеширования '
+        'шаблонов и с кешированным загрузчиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--renders',
+            type=int,
+            default=100,
+            help='Количество отрисовок для каждого варианта.'
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            nargs='+',
+            default=[settings.POSTS_ON_PAGE],
+            help='Количество публикаций на странице, можно несколько.'
+        )
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        for posts in options['posts']:
+            context = self.get_context(posts)
+            for label, cached in (
+                ('без кеширования шаблонов', False),
+                ('с кешированным загрузчиком', True),
+            ):
+                with override_settings(
+                    TEMPLATES=get_templates_settings(cached),
+                    CACHES={'default': {
+                        'BACKEND':
+                            'django.core.cache.backends.dummy.DummyCache'
+                    }},
+                ):
+                    if cached:
+                        warm_up_templates()
+                    elapsed = self.measure(
+                        request, context, options['renders']
+                    )
+                self.stdout.write(
+                    f'Главная страница, {posts} публикаций, {label}: '
+                    f'{elapsed * 1000:.2f} мс на отрисовку'
+                )
+
+    def get_context(self, posts):
+        """Returns the context of the first page of the index."""
+        paginator = Paginator(Post.published.all(), posts)
+        page = paginator.page(1)
+        return {
+            'page_obj': page,
+            'paginator': paginator,
+            'is_paginated': page.has_other_pages(),
+            'post_list': list(page.object_list),
+        }
+
+    def measure(self, request, context, renders):
+        """Returns the mean time of rendering the index page."""
+        start = time.perf_counter()
+        for _ in range(renders):
+            render_to_string('blog/index.html', context, request)
+        return (time.perf_counter() - start) / renders
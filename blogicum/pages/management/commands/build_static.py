@@ -0,0 +1,68 @@
+import base64
+import hashlib
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestFilesMixin,
+                                                staticfiles_storage)
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django_bootstrap5.core import get_bootstrap_setting
+
+
+def check_integrity(content, integrity):
+    """Checks the content against the Subresource Integrity value."""
+    algorithm, _, expected = integrity.partition('-')
+    digest = hashlib.new(algorithm, content).digest()
+    return base64.b64encode(digest).decode() == expected
+
+
+class Command(BaseCommand):
+    """Vendors third-party assets and collects hashed compressed files."""
+
+    help = (
+        'Скачивает сторонние статические файлы, сохраняет статику с хешем '
+        'содержимого в именах и сжатыми копиями gzip и brotli.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-vendor',
+            action='store_true',
+            help='Не скачивать сторонние файлы.'
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            raise CommandError(
+                'Укажите в STATICFILES_STORAGE хранилище с манифестом, '
+                'например blogicum.storage.'
+                'CompressedManifestStaticFilesStorage.'
+            )
+        if not options['skip_vendor']:
+            for name, source in settings.VENDORED_ASSETS.items():
+                self.vendor(name, get_bootstrap_setting(source))
+        call_command(
+            'collectstatic',
+            interactive=False,
+            verbosity=options['verbosity'],
+        )
+
+    def vendor(self, name, source):
+        """Downloads the asset into STATICFILES_DIRS if it is missing."""
+        target = Path(settings.STATICFILES_DIRS[0]) / name
+        integrity = source.get('integrity')
+        if target.exists() and (
+            not integrity or check_integrity(target.read_bytes(), integrity)
+        ):
+            return
+        with urlopen(source['url'], timeout=30) as response:
+            content = response.read()
+        if integrity and not check_integrity(content, integrity):
+            raise CommandError(
+                f'Содержимое {source["url"]} не совпадает с {integrity}.'
+            )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        self.stdout.write(f'Скачан {name}')
@@ -0,0 +1,103 @@
+import statistics
+import threading
+import time
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """Measures request latency with different connection lifetimes."""
+
+    help = (
+        'Отправляет запросы к сайту через WSGI-сервер с одним рабочим '
+        'потоком и измеряет задержку при разных значениях CONN_MAX_AGE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Количество запросов для каждого значения CONN_MAX_AGE.'
+        )
+        parser.add_argument(
+            '--path',
+            default='/',
+            help='Запрашиваемый адрес.'
+        )
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            nargs='+',
+            default=[0, 60],
+            help='Значения CONN_MAX_AGE, можно несколько.'
+        )
+
+    def handle(self, *args, **options):
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(count_connection)
+        database = connections.settings[DEFAULT_DB_ALIAS]
+        original_max_age = database['CONN_MAX_AGE']
+        # Without caches every request renders the page from the database.
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+        }}):
+            try:
+                for max_age in options['conn_max_age']:
+                    database['CONN_MAX_AGE'] = max_age
+                    opened.clear()
+                    latencies = self.measure(
+                        options['path'], options['requests']
+                    )
+                    self.stdout.write(
+                        f'CONN_MAX_AGE={max_age}: '
+                        f'в среднем {statistics.mean(latencies):.2f} мс, '
+                        f'p95 {self.percentile(latencies, 95):.2f} мс, '
+                        f'открыто соединений: {len(opened)}'
+                    )
+            finally:
+                database['CONN_MAX_AGE'] = original_max_age
+                connection_created.disconnect(count_connection)
+
+    def measure(self, path, requests):
+        """
+        Serves the site in a new worker thread, so the connections of the
+        previous run are not reused, and returns the latencies in ms.
+        """
+        server = make_server(
+            '127.0.0.1', 0, get_wsgi_application(), handler_class=QuietHandler
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f'http://127.0.0.1:{server.server_port}{path}'
+        latencies = []
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                with urlopen(url) as response:
+                    response.read()
+                latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            server.shutdown()
+            server.server_close()
+        return latencies
+
+    @staticmethod
+    def percentile(values, percent):
+        values = sorted(values)
+        return values[min(len(values) * percent // 100, len(values) - 1)]
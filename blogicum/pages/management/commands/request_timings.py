@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.metrics import (REGISTRY, REQUEST_DURATION, REQUEST_QUERIES,
+                              REQUEST_SQL_DURATION)
+
+# Histograms of the report: key -> metric
+HISTOGRAMS = {
+    'duration': REQUEST_DURATION,
+    'queries': REQUEST_QUERIES,
+    'sql': REQUEST_SQL_DURATION,
+}
+BASELINE_NAME = 'request_timings.baseline'
+
+
+def add(current, amounts):
+    if current is None:
+        return list(amounts)
+    return [old + new for old, new in zip(current, amounts)]
+
+
+def collect_by_view():
+    """
+    Returns the histograms of all workers summed by view name:
+    view -> key -> [cumulative bucket counts..., sum, count].
+    """
+    totals = REGISTRY.collect()
+    views = {}
+    for key, metric in HISTOGRAMS.items():
+        for labels, amounts in totals.get(metric.name, {}).items():
+            view = views.setdefault(dict(labels)['view'], {})
+            view[key] = add(view.get(key), amounts)
+    return views
+
+
+def percentile(amounts, buckets, percent):
+    """Returns the upper bound of the bucket holding the percentile."""
+    *counts, _, count = amounts
+    for bound, seen in zip(buckets, counts):
+        if seen >= count * percent / 100:
+            return bound
+    return buckets[-1]
+
+
+class Command(BaseCommand):
+    """Prints the request times recorded by URL names."""
+
+    help = (
+        'Выводит статистику времени обработки запросов по именам '
+        'адресов, собранную всеми рабочими процессами в METRICS_DIR.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Считать статистику заново с текущего момента.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.METRICS_DIR:
+            raise CommandError(
+                'Статистика собирается в процессах сервера, задайте общий '
+                'для них каталог METRICS_DIR, чтобы команда могла её '
+                'прочитать.'
+            )
+        views = collect_by_view()
+        baseline_path = Path(settings.METRICS_DIR) / BASELINE_NAME
+        if options['reset']:
+            baseline_path.write_text(json.dumps(views))
+            self.stdout.write(self.style.SUCCESS('Статистика сброшена'))
+            return
+        baseline = (
+            json.loads(baseline_path.read_text())
+            if baseline_path.exists() else {}
+        )
+        self.stdout.write(
+            f'{"Адрес":<28}{"Запросов":>10}{"Среднее, мс":>13}'
+            f'{"p50, мс":>9}{"p95, мс":>9}{"SQL-запросов":>14}'
+            f'{"SQL, мс":>9}'
+        )
+        for name, view in sorted(views.items()):
+            self.write_row(name, view, baseline.get(name, {}))
+
+    def write_row(self, name, view, baseline):
+        """Writes the statistics of the view since the baseline."""
+        since = {
+            key: add(
+                [-amount for amount in baseline[key]], amounts
+            ) if key in baseline else amounts
+            for key, amounts in view.items()
+        }
+        duration = since.get('duration')
+        if not duration or not duration[-1]:
+            return
+        count = duration[-1]
+        buckets = REQUEST_DURATION.buckets
+        queries = since.get('queries', [0, 0])
+        sql = since.get('sql', [0, 0])
+        self.stdout.write(
+            f'{name:<28}{count:>10}'
+            f'{duration[-2] / count * 1000:>13.1f}'
+            f'{percentile(duration, buckets, 50) * 1000:>9.0f}'
+            f'{percentile(duration, buckets, 95) * 1000:>9.0f}'
+            f'{queries[-2] / (queries[-1] or 1):>14.1f}'
+            f'{sql[-2] / (sql[-1] or 1) * 1000:>9.1f}'
+        )
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def is_vendored(name):
+    """Whether the build step has downloaded the asset."""
+    return name in settings.VENDORED_ASSETS and bool(finders.find(name))
+
+
+@register.simple_tag
+def vendored_bootstrap_css():
+    """
+    Links the local copy of Bootstrap, served with the content hash in the
+    name, or the CDN copy until `manage.py build_static` is run.
+    """
+    name = 'vendor/bootstrap/bootstrap.min.css'
+    if not is_vendored(name):
+        return bootstrap_css()
+    return format_html('<link href="{}" rel="stylesheet">', static(name))
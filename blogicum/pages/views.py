@@ -1,6 +1,29 @@
+import mimetypes
+import os
+import re
+from http import HTTPStatus
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
 from django.views.generic import TemplateView
 
+from blogicum.metrics import FILE_RESPONSES, REGISTRY
+from blogicum.storage import PRECOMPRESSED
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+CHUNK_SIZE = 64 * 1024
+
 
 class About(TemplateView):
     """CBV that displays "About" page based on 'about.html' template."""
@@ -24,3 +47,232 @@ def page_not_found(request, exception):
 
 def server_error(request):
     return render(request, 'pages/500.html', status=500)
+
+
+def metrics_allowed(request):
+    """Whether the request may read the metrics, denied if unconfigured."""
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.META.get(
+            'HTTP_AUTHORIZATION', ''
+        ).partition(' ')
+        if scheme.lower() == 'bearer' and constant_time_compare(
+            token, settings.METRICS_TOKEN
+        ):
+            return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+@never_cache
+@require_safe
+def metrics(request):
+    """
+    Returns the metrics of all worker processes in the Prometheus text
+    format, raises 404 error unless the client sends METRICS_TOKEN or
+    connects from METRICS_ALLOWED_IPS.
+    """
+    if not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(
+        REGISTRY.expose(), content_type='text/plain; version=0.0.4'
+    )
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) of the single byte range from the Range header,
+    None if the header is not a single byte range, or raises ValueError
+    if the range is not satisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end or size - 1), size - 1)
+    if start > end or start >= size:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def read_range(path, start, length):
+    """Yields the bytes of the file range in chunks."""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(path, full_path, content_type):
+    """Returns the empty response asking the front-end to send the file."""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE_HEADER == 'X-Accel-Redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+        )
+    else:
+        response[settings.MEDIA_SENDFILE_HEADER] = full_path
+    return response
+
+
+def range_response(request, full_path, size, validators, content_type):
+    """
+    Returns the response with the requested byte range of the file, or
+    the whole file if the request has no usable Range header.
+    """
+    etag, last_modified = validators
+    if_range = request.META.get('HTTP_IF_RANGE')
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and (
+        not if_range
+        or if_range == etag
+        or parse_http_date_safe(if_range) == last_modified
+    ):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            response = HttpResponse(
+                status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    if byte_range is None:
+        return FileResponse(open(full_path, 'rb'), content_type=content_type)
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        read_range(full_path, start, end - start + 1),
+        status=HTTPStatus.PARTIAL_CONTENT,
+        content_type=content_type,
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    return response
+
+
+def stat_file(root, path):
+    """Returns the full path and stat of the regular file under the root."""
+    try:
+        full_path = safe_join(root, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path, stat
+
+
+def accepted_encodings(request):
+    """Returns the content codings accepted by the client."""
+    encodings = set()
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = coding.partition(';')
+        quality = params.strip().partition('q=')[2]
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves the uploaded file with ETag and Last-Modified headers, answers
+    conditional requests with 304 and supports single byte ranges.
+    Hands the transfer off to the front-end server if
+    MEDIA_SENDFILE_HEADER is set.
+    """
+    full_path, stat = stat_file(settings.MEDIA_ROOT, path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(full_path)
+        content_type = content_type or 'application/octet-stream'
+        if settings.MEDIA_SENDFILE_HEADER:
+            response = sendfile_response(path, full_path, content_type)
+        else:
+            response = range_response(
+                request, full_path, stat.st_size, (etag, last_modified),
+                content_type
+            )
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    )
+    response['Accept-Ranges'] = 'bytes'
+    FILE_RESPONSES.inc(
+        kind='media', status=response.status_code,
+        encoding=response.get('Content-Encoding', 'identity'),
+    )
+    return response
+
+
+def find_static_variant(request, path):
+    """
+    Returns the full path, stat and content coding of the best variant of
+    the static file accepted by the client.
+    """
+    accepted = accepted_encodings(request)
+    for encoding, (suffix, _) in PRECOMPRESSED.items():
+        if encoding not in accepted:
+            continue
+        try:
+            return (
+                *stat_file(settings.STATIC_ROOT, path + suffix), encoding
+            )
+        except Http404:
+            continue
+    return (*stat_file(settings.STATIC_ROOT, path), None)
+
+
+@require_safe
+def serve_static(request, path):
+    """
+    Serves the collected static file, preferring its pre-compressed
+    variant accepted by the client. Files with a content hash in the
+    name are cached forever, others are revalidated on every use.
+    """
+    content_type, _ = mimetypes.guess_type(path)
+    full_path, stat, content_encoding = find_static_variant(request, path)
+    etag = (
+        f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-'
+        f'{content_encoding or "identity"}"'
+    )
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        response = FileResponse(
+            open(full_path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+            filename=os.path.basename(path),
+        )
+        if content_encoding:
+            response['Content-Encoding'] = content_encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(int(stat.st_mtime))
+    response['Vary'] = 'Accept-Encoding'
+    if HASHED_NAME_RE.search(path):
+        response['Cache-Control'] = (
+            f'public, max-age={settings.STATIC_CACHE_MAX_AGE}, immutable'
+        )
+    else:
+        response['Cache-Control'] = 'public, no-cache'
+    FILE_RESPONSES.inc(
+        kind='static', status=response.status_code,
+        encoding=content_encoding or 'identity',
+    )
+    return response
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = '/admin/blog/post/'
+
+
+def changelist_queries(admin_client, mixer, posts):
+    mixer.cycle(posts).blend('blog.Post')
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(CHANGELIST_URL)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_changelist_queries_do_not_grow(admin_client, mixer):
+    mixer.cycle(3).blend('blog.Category')
+    few = changelist_queries(admin_client, mixer, 2)
+    many = changelist_queries(admin_client, mixer, 30)
+    assert few == many, (
+        "Убедитесь, что количество запросов к БД на странице списка"
+        f" публикаций в админке не зависит от их числа: {few} и {many}."
+    )
+
+
+def test_changelist_estimated_count(admin_client, mixer, monkeypatch):
+    mixer.cycle(2).blend('blog.Post')
+    monkeypatch.setattr(
+        'blog.paginators.estimate_count', lambda queryset: 1_000_000
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(CHANGELIST_URL)
+    assert response.context['cl'].result_count == 1_000_000
+    assert not any('COUNT(' in query['sql'] for query in queries), (
+        "Убедитесь, что для больших таблиц список публикаций в админке"
+        " использует оценку количества строк вместо COUNT(*)."
+    )
+
+
+def test_change_form_autocomplete(admin_client, post_with_published_location):
+    response = admin_client.get(
+        f'{CHANGELIST_URL}{post_with_published_location.pk}/change/'
+    )
+    content = response.content.decode()
+    for field in ('author', 'location'):
+        assert f'id="id_{field}" class="admin-autocomplete' in content, (
+            "Убедитесь, что автор и местоположение публикации выбираются"
+            " в админке через автодополнение."
+        )
+
+
+def test_changelist_edits_category(admin_client, mixer):
+    post = mixer.blend('blog.Post', is_published=True)
+    category = mixer.blend('blog.Category')
+    response = admin_client.post(CHANGELIST_URL, {
+        'form-TOTAL_FORMS': 1,
+        'form-INITIAL_FORMS': 1,
+        'form-0-id': post.pk,
+        'form-0-is_published': 'on',
+        'form-0-category': category.pk,
+        '_save': 'Сохранить',
+    })
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.category == category, (
+        "Убедитесь, что категорию публикации можно изменить в списке"
+        " публикаций в админке."
+    )
@@ -0,0 +1,194 @@
+"""
+Query count, latency and memory of every route against a stored baseline.
+
+The volumes are set by BENCHMARK_POSTS, BENCHMARK_COMMENTS and
+BENCHMARK_USERS (e.g. 100000, 1000000 and 10000), the baseline is kept
+per volume in benchmark_baseline.json and rewritten for the current
+volume with BENCHMARK_UPDATE_BASELINE=1. The query count may not grow.
+The median latency and peak memory depend on the machine and are only
+checked with BENCHMARK=1, where they may exceed the baseline
+BENCHMARK_TOLERANCE times; p95 is recorded for reference only.
+"""
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+POSTS = int(os.getenv('BENCHMARK_POSTS', '300'))
+COMMENTS = int(os.getenv('BENCHMARK_COMMENTS', '3000'))
+USERS = int(os.getenv('BENCHMARK_USERS', '50'))
+REPEAT = int(os.getenv('BENCHMARK_REPEAT', '20'))
+BENCHMARK = os.getenv('BENCHMARK') == '1'
+TOLERANCE = float(os.getenv('BENCHMARK_TOLERANCE', '3'))
+UPDATE_BASELINE = os.getenv('BENCHMARK_UPDATE_BASELINE') == '1'
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+VOLUME = f'posts={POSTS},comments={COMMENTS},users={USERS}'
+BATCH_SIZE = 5000
+
+ROUTES = {
+    'blog:index': lambda data: {},
+    'blog:category_posts': lambda data: {
+        'category_slug': data['category'].slug
+    },
+    'blog:create_post': lambda data: {},
+    'blog:post_detail': lambda data: {'post_pk': data['post'].pk},
+    'blog:post_comments': lambda data: {'post_pk': data['post'].pk},
+    'blog:edit_post': lambda data: {'post_pk': data['post'].pk},
+    'blog:delete_post': lambda data: {'post_pk': data['post'].pk},
+    'blog:add_comment': lambda data: {'post_pk': data['post'].pk},
+    'blog:edit_comment': lambda data: {
+        'post_pk': data['post'].pk, 'comment_pk': data['comment'].pk
+    },
+    'blog:delete_comment': lambda data: {
+        'post_pk': data['post'].pk, 'comment_pk': data['comment'].pk
+    },
+    'blog:edit_profile': lambda data: {},
+    'blog:profile': lambda data: {'username': data['author'].username},
+    'pages:about': lambda data: {},
+    'pages:rules': lambda data: {},
+}
+
+
+def seed(author, category, location):
+    """Creates the posts, users and comments in batches."""
+    from blog.models import Comment, Post, make_excerpt
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        (User(username=f'benchmark-{number}', password='!')
+         for number in range(USERS - 1)),
+        batch_size=BATCH_SIZE,
+    )
+    authors = list(
+        User.objects.exclude(pk=author.pk).values_list('pk', flat=True)
+    )
+    rng = random.Random(0)
+    now = timezone.now()
+    text = ' '.join(['Текст публикации для замеров.'] * 40)
+    Post.objects.bulk_create(
+        (Post(
+            title=f'Публикация {number}', text=text,
+            excerpt=make_excerpt(text),
+            pub_date=now - timedelta(minutes=number),
+            author_id=author.pk if number == 0 else rng.choice(authors),
+            category=category, location=location,
+        ) for number in range(POSTS)),
+        batch_size=BATCH_SIZE,
+    )
+    posts = list(Post.objects.values_list('pk', flat=True))
+    counts = dict.fromkeys(posts, 0)
+
+    def comments():
+        for number in range(COMMENTS):
+            post_pk = posts[0] if number % 10 == 0 else rng.choice(posts)
+            counts[post_pk] += 1
+            yield Comment(
+                text=f'Комментарий {number}', post_id=post_pk,
+                author_id=author.pk if number == 0 else rng.choice(authors),
+            )
+
+    Comment.objects.bulk_create(comments(), batch_size=BATCH_SIZE)
+    Post.objects.bulk_update(
+        [Post(pk=pk, comment_count=count) for pk, count in counts.items()],
+        ['comment_count'], batch_size=BATCH_SIZE,
+    )
+
+
+@pytest.fixture(scope='module')
+def benchmark_data(django_db_setup, django_db_blocker):
+    from blog.models import Category, Comment, Post
+
+    with django_db_blocker.unblock():
+        author = mixer.blend(get_user_model())
+        category = mixer.blend('blog.Category', is_published=True)
+        location = mixer.blend('blog.Location', is_published=True)
+        try:
+            seed(author, category, location)
+            post = Post.objects.filter(author=author).get()
+            yield {
+                'author': author,
+                'category': category,
+                'post': post,
+                'comment': post.comments.filter(author=author).first(),
+            }
+        finally:
+            Comment.objects.all()._raw_delete(connection.alias)
+            Post.objects.all()._raw_delete(connection.alias)
+            get_user_model().objects.all().delete()
+            Category.objects.all().delete()
+            location.delete()
+
+
+def measure(client, url):
+    """Returns the query count, latency and peak memory of the route."""
+    client.get(url)
+    latencies = []
+    for _ in range(REPEAT):
+        cache.clear()
+        start = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, url
+    cache.clear()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'queries': len(queries),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(statistics.quantiles(latencies, n=20)[-1], 2),
+        'peak_kib': peak // 1024,
+    }
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('route', ROUTES)
+def test_route_does_not_regress(benchmark_data, route):
+    client = Client()
+    client.force_login(benchmark_data['author'])
+    result = measure(
+        client, reverse(route, kwargs=ROUTES[route](benchmark_data))
+    )
+    baseline = load_baseline()
+    if UPDATE_BASELINE:
+        baseline.setdefault(VOLUME, {})[route] = result
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n'
+        )
+        return
+    expected = baseline.get(VOLUME, {}).get(route)
+    if expected is None:
+        pytest.skip(f'Нет базовых замеров для {route} при {VOLUME}.')
+    assert result['queries'] <= expected['queries'], (
+        f"Убедитесь, что количество запросов к БД на странице `{route}`"
+        f" не выросло: {result['queries']} вместо {expected['queries']}."
+    )
+    if not BENCHMARK:
+        return
+    for metric in ('p50_ms', 'peak_kib'):
+        assert result[metric] <= expected[metric] * TOLERANCE, (
+            f"Убедитесь, что `{metric}` страницы `{route}` не выросло:"
+            f" {result[metric]} при базовом значении {expected[metric]}."
+        )
@@ -0,0 +1,138 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " комментариев публикации."
+    )
+
+    Comment.objects.filter(post=post)[:1].get().delete()
+    Comment.objects.filter(post=post).delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что при удалении комментариев, в том числе массовом,"
+        " уменьшается счётчик комментариев публикации."
+    )
+
+
+def test_recount_comments_fixes_drift(
+        mixer: Mixer, post_with_published_location
+):
+    from blog.models import Comment, Post
+
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command('recount_comments', batch_size=1, stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+
+def test_recount_comments_drops_cached_pages(
+        mixer: Mixer, post_with_published_location
+):
+    from blog.cache import get_generations
+    from blog.models import Comment, Post
+
+    post = post_with_published_location
+    mixer.blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    groups = ('posts', 'feed', 'list_pages')
+    before = get_generations(*groups)
+    call_command('recount_comments', stdout=StringIO())
+    after = get_generations(*groups)
+    assert all(old != new for old, new in zip(before, after)), (
+        "Убедитесь, что после исправления счётчиков комментариев"
+        " сбрасываются закешированные страницы и карточки публикаций."
+    )
+
+
+def test_feed_does_not_join_comments(
+        client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        client.get('/')
+    assert not any('blog_comment' in q['sql'] for q in queries), (
+        "Убедитесь, что лента публикаций не обращается к таблице"
+        " комментариев."
+    )
+
+
+def test_post_delete_skips_counter_updates(
+        mixer: Mixer, user_client, post_with_published_location
+):
+    from blog.models import Comment, Post
+
+    post = post_with_published_location
+    mixer.cycle(5).blend(Comment, post=post)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f'/posts/{post.pk}/delete/')
+    assert response.status_code == 302
+    assert not Post.objects.filter(pk=post.pk).exists()
+    updates = [
+        query['sql'] for query in queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert not updates, (
+        "Убедитесь, что при удалении публикации счётчик комментариев не"
+        " обновляется для каждого удаляемого комментария."
+    )
+
+
+def test_failed_post_delete_keeps_counter_updates(
+        mixer: Mixer, post_with_published_location
+):
+    from django.db.models.signals import post_delete
+
+    from blog.models import Comment
+
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend(Comment, post=post)
+
+    def fail(**kwargs):
+        raise DatabaseError('Удаление прервано')
+
+    post_delete.connect(fail, sender=Comment)
+    try:
+        with pytest.raises(DatabaseError), transaction.atomic():
+            post.delete()
+    finally:
+        post_delete.disconnect(fail, sender=Comment)
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что после неудачного удаления публикации счётчик"
+        " комментариев снова уменьшается при удалении комментария."
+    )
+
+
+def test_user_delete_keeps_other_counters(
+        mixer: Mixer, another_user, post_with_published_location
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post, author=another_user)
+    mixer.blend(Comment, post=post)
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении пользователя уменьшаются счётчики"
+        " комментариев публикаций других авторов."
+    )
@@ -0,0 +1,67 @@
+import re
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+MORE_COMMENTS_URL = re.compile(r'href="(/posts/\d+/comments/\?cursor=[\w-]+)"')
+
+
+@pytest.fixture
+def comments(mixer: Mixer, settings, post_with_published_location):
+    settings.COMMENTS_ON_PAGE = 3
+    return mixer.cycle(7).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+
+
+def test_comments_are_paginated(
+        user_client, post_with_published_location, comments
+):
+    response = user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert len(response.context['comments']) == 3, (
+        "Убедитесь, что на странице публикации выводится ограниченное"
+        " количество комментариев."
+    )
+    seen = [comment.pk for comment in response.context['comments']]
+    content = response.content.decode()
+    while MORE_COMMENTS_URL.search(content):
+        fragment = user_client.get(MORE_COMMENTS_URL.search(content)[1])
+        assert fragment.status_code == 200
+        assert '<html' not in fragment.content.decode()
+        seen.extend(comment.pk for comment in fragment.context['comments'])
+        content = fragment.content.decode()
+    assert seen == [comment.pk for comment in comments]
+
+
+def test_comments_of_hidden_post_are_hidden(
+        another_user_client, post_with_published_location, comments
+):
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    response = another_user_client.get(
+        f'/posts/{post_with_published_location.id}/comments/'
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize('cursor', [
+    'garbage', 'WyJuIiwgNV0', 'WyJuIiwgWyJub3RhZGF0ZSIsICJ4Il1d',
+    'WyJuIiwgW251bGwsIG51bGxdXQ',
+    # Two ints, two datetimes and a pk overflowing the 64-bit column.
+    'WyJuIixbMSwyXV0',
+    'WyJuIixbIjIwMjQtMDEtMDFUMDA6MDA6MDArMDA6MDAiLCIyMDI0LTAxLTAxVDAwOjAw'
+    'OjAwKzAwOjAwIl1d',
+    'WyJuIixbIjIwMjQtMDEtMDFUMDA6MDA6MDArMDA6MDAiLDEwMDAwMDAwMDAwMDAwMDAw'
+    'MDAwMDAwMDAwMDAwMDAwMDBdXQ',
+])
+def test_comments_invalid_cursor(
+        client, post_with_published_location, cursor
+):
+    post_id = post_with_published_location.id
+    for url in (f'/posts/{post_id}/comments/', f'/posts/{post_id}/'):
+        assert client.get(url, {'cursor': cursor}).status_code == 404, (
+            "Убедитесь, что для некорректного курсора комментариев"
+            " возвращается ошибка 404."
+        )
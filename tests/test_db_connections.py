@@ -0,0 +1,197 @@
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+class FakeConnection:
+    def __init__(self, usable, health_checks=True):
+        self.connection = object()
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.in_atomic_block = False
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+@pytest.mark.parametrize('usable, health_checks, closed', [
+    (False, True, True),
+    (True, True, False),
+    (False, False, False),
+])
+def test_health_check_closes_broken_connections(
+        monkeypatch, usable, health_checks, closed
+):
+    import blogicum.db
+
+    connection = FakeConnection(usable, health_checks)
+    monkeypatch.setattr(blogicum.db.connections, 'all', lambda: [connection])
+    blogicum.db.check_connections()
+    assert (connection.connection is None) == closed, (
+        "Убедитесь, что в начале запроса закрываются только неработающие"
+        " соединения и только при включённой проверке CONN_HEALTH_CHECKS."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_test_reports_latency(many_posts_with_published_locations):
+    out = StringIO()
+    call_command('load_test', requests=3, conn_max_age=[0, 60], stdout=out)
+    for max_age in (0, 60):
+        assert f'CONN_MAX_AGE={max_age}: в среднем' in out.getvalue()
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        import psycopg2
+
+        if self.connection.broken:
+            raise psycopg2.OperationalError('server closed the connection')
+        if not self.connection.autocommit:
+            self.connection.info.transaction_status = 2
+
+
+class FakeInfo:
+    transaction_status = 0
+
+
+class FakePgConnection:
+    """Idle psycopg2 connection without autocommit, as the pool keeps it."""
+
+    isolation_level = 1
+
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.closed = 0
+        self.autocommit = False
+        self.info = FakeInfo()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.info.transaction_status = 0
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool:
+    def __init__(self, *connections, maxconn=10):
+        self.idle = list(connections)
+        self.maxconn = maxconn
+        self.returned = []
+
+    def getconn(self):
+        return self.idle.pop(0)
+
+    def putconn(self, connection, close=False):
+        self.returned.append((connection, close))
+
+
+@pytest.fixture
+def pool_wrapper(monkeypatch):
+    pytest.importorskip('psycopg2')
+    from blogicum.db.postgresql_pool import base
+
+    monkeypatch.setattr(
+        base.psycopg2.extras, 'register_default_jsonb', lambda **kwargs: None
+    )
+    wrapper = base.DatabaseWrapper({
+        'OPTIONS': {}, 'CONN_HEALTH_CHECKS': True, 'POOL': {},
+    }, 'pooled')
+    wrapper.pool = FakePool()
+    monkeypatch.setattr(
+        wrapper, 'get_pool', lambda conn_params=None: wrapper.pool
+    )
+    return wrapper
+
+
+def test_pool_health_check_leaves_connection_idle(pool_wrapper):
+    healthy = FakePgConnection()
+    pool_wrapper.pool = FakePool(healthy)
+    assert pool_wrapper.get_new_connection({}) is healthy
+    assert healthy.info.transaction_status == 0, (
+        "Убедитесь, что проверка соединения из пула не оставляет открытую"
+        " транзакцию."
+    )
+
+
+def test_pool_replaces_broken_connection(pool_wrapper):
+    broken, healthy = FakePgConnection(broken=True), FakePgConnection()
+    pool_wrapper.pool = FakePool(broken, healthy)
+    assert pool_wrapper.get_new_connection({}) is healthy, (
+        "Убедитесь, что неработающее соединение из пула заменяется новым."
+    )
+    assert pool_wrapper.pool.returned == [(broken, True)]
+
+
+def test_pool_checks_replacement_connection(pool_wrapper):
+    first = FakePgConnection(broken=True)
+    second = FakePgConnection(broken=True)
+    healthy = FakePgConnection()
+    pool_wrapper.pool = FakePool(first, second, healthy)
+    assert pool_wrapper.get_new_connection({}) is healthy, (
+        "Убедитесь, что соединение, взятое из пула взамен неработающего,"
+        " тоже проверяется."
+    )
+    assert pool_wrapper.pool.returned == [(first, True), (second, True)]
+
+
+def test_pool_without_working_connections_fails(pool_wrapper):
+    import psycopg2
+
+    pool_wrapper.pool = FakePool(
+        FakePgConnection(broken=True), FakePgConnection(broken=True),
+        maxconn=1,
+    )
+    with pytest.raises(psycopg2.OperationalError):
+        pool_wrapper.get_new_connection({})
+    assert all(close for _, close in pool_wrapper.pool.returned)
+
+
+def test_pool_waits_for_free_connection(monkeypatch):
+    pytest.importorskip('psycopg2')
+    from blogicum.db.postgresql_pool import base
+
+    monkeypatch.setattr(
+        base.psycopg2, 'connect', lambda *args, **kwargs: FakePgConnection()
+    )
+    pool = base.BlockingConnectionPool(0, 1, timeout=0.01)
+    connection = pool.getconn()
+    with pytest.raises(base.PoolError):
+        pool.getconn()
+    timer = threading.Timer(0.05, pool.putconn, [connection])
+    pool.timeout = 5
+    timer.start()
+    assert pool.getconn() is not None, (
+        "Убедитесь, что при занятом пуле запрос ждёт освободившееся"
+        " соединение."
+    )
+    timer.join()
+
+
+@pytest.mark.parametrize('errors_occurred', [False, True])
+def test_pool_close_returns_connection(pool_wrapper, errors_occurred):
+    connection = FakePgConnection()
+    pool_wrapper.connection = connection
+    pool_wrapper.errors_occurred = errors_occurred
+    pool_wrapper._close()
+    assert pool_wrapper.pool.returned == [(connection, errors_occurred)], (
+        "Убедитесь, что соединение возвращается в пул, а после ошибок"
+        " закрывается."
+    )
@@ -0,0 +1,121 @@
+from io import BytesIO, StringIO
+
+from datetime import timedelta
+
+import pytest
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+ORIENTATION = 0x0112
+
+
+def jpeg_with_exif(size=(300, 200)):
+    image = Image.new('RGB', size, color=(73, 109, 137))
+    exif = image.getexif()
+    exif[ORIENTATION] = 6
+    exif[0x010F] = 'Camera maker'
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', exif=exif)
+    return buffer
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category):
+    def make(image_file):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=image_file,
+        )
+    return make
+
+
+def run_worker():
+    call_command('process_image_jobs', once=True, stdout=StringIO(),
+                 stderr=StringIO())
+
+
+def test_upload_is_queued_not_processed(make_post):
+    from blog.models import ImageJob
+
+    post = make_post(ImageFile(jpeg_with_exif(), name='exif.jpg'))
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.PENDING
+    post.title = 'Другой заголовок'
+    post.save()
+    assert ImageJob.objects.filter(post=post).count() == 1, (
+        "Убедитесь, что изображение ставится в очередь только при загрузке."
+    )
+
+
+def test_worker_strips_exif_and_applies_orientation(make_post):
+    from blog.models import ImageJob
+
+    post = make_post(ImageFile(jpeg_with_exif(), name='exif.jpg'))
+    run_worker()
+    assert ImageJob.objects.get(post=post).status == ImageJob.DONE
+    with post.image.storage.open(post.image.name) as file:
+        with Image.open(file) as image:
+            assert not image.getexif()
+            assert image.size == (200, 300)
+
+
+@pytest.mark.parametrize('name, content', [
+    ('exif.jpg', jpeg_with_exif().getvalue()),
+    ('broken.jpg', b'not an image'),
+])
+def test_worker_drops_cached_pages(make_post, name, content):
+    from blog.cache import get_generations
+
+    post = make_post(ContentFile(content, name=name))
+    groups = (f'post:{post.pk}', 'list_pages', 'feed')
+    before = get_generations(*groups)
+    run_worker()
+    after = get_generations(*groups)
+    assert all(old != new for old, new in zip(before, after)), (
+        "Убедитесь, что после обработки изображения сбрасываются"
+        " закешированные страницы и карточка публикации."
+    )
+
+
+@pytest.mark.parametrize('attempts, status', [(1, 'pending'), (3, 'failed')])
+def test_stale_jobs_requeued_until_attempts_used(
+        make_post, settings, attempts, status
+):
+    from blog.models import ImageJob
+
+    settings.POST_IMAGE_JOB_MAX_ATTEMPTS = 3
+    post = make_post(ImageFile(jpeg_with_exif(), name='exif.jpg'))
+    ImageJob.objects.filter(post=post).update(
+        status=ImageJob.PROCESSING, attempts=attempts,
+        started_at=timezone.now() - timedelta(hours=1),
+    )
+    call_command(
+        'process_image_jobs', once=True, stale_after=60,
+        stdout=StringIO(), stderr=StringIO(),
+    )
+    job = ImageJob.objects.get(post=post)
+    if status == 'failed':
+        assert job.status == ImageJob.FAILED, (
+            "Убедитесь, что задача, прервавшаяся"
+            " POST_IMAGE_JOB_MAX_ATTEMPTS раз, больше не возвращается"
+            " в очередь."
+        )
+    else:
+        assert job.status == ImageJob.DONE
+
+
+def test_worker_drops_invalid_image(make_post):
+    from blog.models import ImageJob
+
+    post = make_post(ContentFile(b'not an image', name='broken.jpg'))
+    run_worker()
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.FAILED
+    post.refresh_from_db()
+    assert not post.image
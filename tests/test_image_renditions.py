@@ -0,0 +1,74 @@
+from io import BytesIO, StringIO
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer: Mixer, user, published_location, published_category
+):
+    img_io = BytesIO()
+    Image.new('RGB', (2000, 1000), color=(73, 109, 137)).save(
+        img_io, format='JPEG'
+    )
+    post = mixer.blend(
+        'blog.Post',
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name='large_image.jpg'),
+    )
+    call_command('process_image_jobs', once=True, stdout=StringIO())
+    return post
+
+
+def rendition_sizes(post):
+    from blog.images import rendition_name
+
+    storage = post.image.storage
+    sizes = {}
+    for rendition in ('thumb', 'detail', 'thumb_webp', 'detail_webp'):
+        name = rendition_name(post.image.name, rendition)
+        if storage.exists(name):
+            with storage.open(name) as file, Image.open(file) as image:
+                sizes[rendition] = (image.format, image.size)
+    return sizes
+
+
+def test_renditions_created_by_worker(post_with_large_image):
+    assert rendition_sizes(post_with_large_image) == {
+        'thumb': ('JPEG', (640, 320)),
+        'detail': ('JPEG', (1280, 640)),
+        'thumb_webp': ('WEBP', (640, 320)),
+        'detail_webp': ('WEBP', (1280, 640)),
+    }
+
+
+def test_post_card_uses_srcset(user_client, post_with_large_image):
+    from blog.images import rendition_name
+
+    content = user_client.get('/').content.decode()
+    thumb = rendition_name(post_with_large_image.image.name, 'thumb')
+    assert thumb in content
+    assert 'srcset=' in content
+    assert 'type="image/webp"' in content
+
+
+def test_backfill_command(post_with_large_image):
+    from blog.images import rendition_name
+
+    storage = post_with_large_image.image.storage
+    for rendition in ('thumb', 'detail_webp'):
+        storage.delete(
+            rendition_name(post_with_large_image.image.name, rendition)
+        )
+    out = StringIO()
+    call_command('generate_renditions', processes=1, stdout=out)
+    assert 'создано копий: 2' in out.getvalue()
+    assert len(rendition_sizes(post_with_large_image)) == 4
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed(user, category):
+    from blog.models import Post
+
+    return Post.published.all()
+
+
+def category_feed(user, category):
+    return category.posts.published()
+
+
+def profile_feed(user, category):
+    return user.posts.published()
+
+
+def own_profile_feed(user, category):
+    return user.posts.with_related_data()
+
+
+def post_comments(user, category):
+    from blog.models import Comment
+
+    return Comment.objects.filter(post_id=1)
+
+
+@pytest.fixture
+def explain():
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        yield lambda queryset: queryset.explain()
+        with connection.cursor() as cursor:
+            cursor.execute('RESET enable_seqscan')
+    elif connection.vendor == 'sqlite':
+        yield lambda queryset: queryset.explain()
+    else:
+        pytest.skip('Планы запросов проверяются для SQLite и PostgreSQL.')
+
+
+@pytest.mark.parametrize('get_queryset, index', [
+    (feed, 'post_feed_pub_date_idx'),
+    (category_feed, 'post_category_pub_date_idx'),
+    (profile_feed, 'post_author_pub_date_idx'),
+    (own_profile_feed, 'post_author_pub_date_idx'),
+    (post_comments, 'comment_post_created_at_idx'),
+])
+def test_feed_queries_use_indexes(
+        explain, user, published_category, get_queryset, index
+):
+    plan = explain(get_queryset(user, published_category))
+    assert index in plan, (
+        f"Убедитесь, что запрос использует индекс `{index}`. План:\n{plan}"
+    )
@@ -0,0 +1,88 @@
+import base64
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def keyset_views(monkeypatch):
+    from blog.views import PaginateMixin
+
+    monkeypatch.setattr(PaginateMixin, 'keyset_pagination', True)
+
+
+def test_keyset_pages_walk_forward_and_back(
+        keyset_views, user, user_client, many_posts_with_published_locations
+):
+    from blog.models import Post
+
+    expected = list(
+        Post.objects.filter(author=user)
+        .order_by('-pub_date', '-pk')
+        .values_list('pk', flat=True)
+    )
+    url = f'/profile/{user.username}/'
+    seen, cursors = [], []
+    response = user_client.get(url)
+    while True:
+        page = response.context['page_obj']
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.pk for post in page)
+        if not page.has_next():
+            break
+        cursors.append(page.next_cursor)
+        response = user_client.get(url, {'cursor': page.next_cursor})
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация выводит все публикации"
+        " без пропусков и повторов."
+    )
+
+    previous = response.context['page_obj'].previous_cursor
+    response = user_client.get(url, {'cursor': previous})
+    assert [post.pk for post in response.context['page_obj']] == (
+        expected[:N_PER_PAGE]
+    )
+
+
+def test_keyset_page_has_no_count_and_offset(
+        keyset_views, client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert response.status_code == 200
+    sql = ' '.join(query['sql'] for query in queries).upper()
+    assert 'COUNT(' not in sql
+    assert 'OFFSET' not in sql
+
+
+def make_cursor(payload):
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+INVALID_CURSORS = [
+    'garbage',
+    make_cursor(['n', 5]),
+    make_cursor(['n', ['notadate', 'x']]),
+    make_cursor(['n', [None, None]]),
+    make_cursor(['n', ['2024-01-01T00:00:00', 1]]),
+    make_cursor(['n', ['2024-13-45T00:00:00+00:00', 1]]),
+    make_cursor(['n', [True, 1]]),
+    make_cursor(['n', {'a': 1, 'b': 2}]),
+    make_cursor(['n', [1, 2]]),
+    make_cursor(['n', ['2024-01-01T00:00:00+00:00'] * 2]),
+    make_cursor(['n', ['2024-01-01T00:00:00+00:00', 10 ** 30]]),
+]
+
+
+@pytest.mark.parametrize('cursor', INVALID_CURSORS)
+def test_keyset_invalid_cursor(keyset_views, client, cursor):
+    assert client.get('/', {'cursor': cursor}).status_code == 404, (
+        "Убедитесь, что для некорректного курсора возвращается ошибка 404."
+    )
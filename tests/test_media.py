@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+CONTENT = b'0123456789abcdef'
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'posts_images').mkdir()
+    (tmp_path / 'posts_images' / 'file.txt').write_bytes(CONTENT)
+    return '/media/posts_images/file.txt'
+
+
+def test_media_served_with_validators(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert b''.join(response.streaming_content) == CONTENT
+    assert response['ETag'].startswith('"')
+    assert response['Last-Modified']
+    assert response['Accept-Ranges'] == 'bytes'
+
+    not_modified = client.get(
+        media_file, HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    not_modified = client.get(
+        media_file, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('header, expected, content_range', [
+    ('bytes=2-5', b'2345', 'bytes 2-5/16'),
+    ('bytes=10-', b'abcdef', 'bytes 10-15/16'),
+    ('bytes=-3', b'def', 'bytes 13-15/16'),
+])
+def test_media_range(client, media_file, header, expected, content_range):
+    response = client.get(media_file, HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert b''.join(response.streaming_content) == expected
+    assert response['Content-Range'] == content_range
+
+
+def test_media_range_not_satisfiable(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=100-')
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response['Content-Range'] == 'bytes */16'
+
+
+def test_media_stale_if_range_sends_whole_file(client, media_file):
+    response = client.get(
+        media_file, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_media_outside_root_not_found(client, media_file):
+    assert client.get('/media/../settings.py').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert client.get('/media/posts_images/').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_media_accel_redirect(client, settings, media_file):
+    settings.MEDIA_SENDFILE_HEADER = 'X-Accel-Redirect'
+    response = client.get(media_file)
+    assert response['X-Accel-Redirect'] == (
+        '/protected-media/posts_images/file.txt'
+    )
+    assert response.content == b''
@@ -0,0 +1,124 @@
+import re
+import shutil
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+TOKEN = 'metrics-token'
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(settings):
+    settings.METRICS_TOKEN = TOKEN
+
+
+def read_sample(client, sample):
+    """Returns the value of the sample from /metrics, 0 if it is absent."""
+    response = client.get('/metrics', HTTP_AUTHORIZATION=f'Bearer {TOKEN}')
+    assert response.status_code == 200, (
+        "Убедитесь, что адрес /metrics доступен с токеном METRICS_TOKEN."
+    )
+    match = re.search(
+        rf'^{re.escape(sample)} (\S+)$', response.content.decode(), re.M
+    )
+    return float(match.group(1)) if match else 0
+
+
+def test_request_and_cache_metrics(client):
+    latency = (
+        'blogicum_request_duration_seconds_count'
+        '{view="blog:index",method="GET",status="200"}'
+    )
+    hits = 'blogicum_cache_requests_total{cache="page",result="hit"}'
+    misses = 'blogicum_cache_requests_total{cache="page",result="miss"}'
+    before = [read_sample(client, name) for name in (latency, hits, misses)]
+    client.get('/')
+    client.get('/')
+    after = [read_sample(client, name) for name in (latency, hits, misses)]
+    assert [new - old for new, old in zip(after, before)] == [2, 1, 1], (
+        "Убедитесь, что метрики учитывают время ответа каждого представления"
+        " и попадания в кеш страниц."
+    )
+    content = client.get(
+        '/metrics', HTTP_AUTHORIZATION=f'Bearer {TOKEN}'
+    ).content.decode()
+    assert '# TYPE blogicum_request_duration_seconds histogram' in content
+    assert 'blogicum_request_queries_bucket{view="blog:index",le="+Inf"}' in (
+        content
+    )
+
+
+def test_write_and_upload_metrics(user_client, post_with_published_location):
+    post = post_with_published_location
+    comments = 'blogicum_writes_total{model="comment",action="create"}'
+    updates = 'blogicum_writes_total{model="post",action="update"}'
+    uploads = 'blogicum_image_upload_bytes_count'
+    names = (comments, updates, uploads)
+    before = [read_sample(user_client, name) for name in names]
+    user_client.post(f'/posts/{post.pk}/comment/', {'text': 'Комментарий'})
+    image = BytesIO()
+    Image.new('RGB', (10, 10)).save(image, format='PNG')
+    response = user_client.post(f'/posts/{post.pk}/edit/', {
+        'title': post.title,
+        'text': post.text,
+        'category': post.category.pk,
+        'location': post.location.pk,
+        'pub_date': post.pub_date.strftime('%Y-%m-%d'),
+        'is_published': True,
+        'image': SimpleUploadedFile(
+            'image.png', image.getvalue(), content_type='image/png'
+        ),
+    })
+    assert response.status_code == 302
+    after = [read_sample(user_client, name) for name in names]
+    assert [new - old for new, old in zip(after, before)] == [1, 1, 1], (
+        "Убедитесь, что метрики учитывают добавление комментариев, изменение"
+        " публикаций и размер загруженных изображений."
+    )
+
+
+@pytest.mark.parametrize('token, allowed_ips, status', [
+    (None, [], 404),
+    ('wrong', [], 404),
+    (TOKEN, [], 200),
+    (None, ['127.0.0.1'], 200),
+    (None, ['10.0.0.2'], 404),
+])
+def test_metrics_access(settings, client, token, allowed_ips, status):
+    settings.METRICS_ALLOWED_IPS = allowed_ips
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+    assert client.get('/metrics', **headers).status_code == status, (
+        "Убедитесь, что метрики доступны только с токеном METRICS_TOKEN"
+        " или с адресов из METRICS_ALLOWED_IPS."
+    )
+
+
+def test_metrics_closed_by_default(settings, client):
+    settings.METRICS_TOKEN = ''
+    settings.METRICS_ALLOWED_IPS = []
+    assert client.get('/metrics').status_code == 404, (
+        "Убедитесь, что без настроек доступа метрики закрыты."
+    )
+
+
+def test_metrics_summed_across_processes(settings, tmp_path, client):
+    from blogicum.metrics import REGISTRY
+
+    settings.METRICS_DIR = str(tmp_path)
+    sample = (
+        'blogicum_request_duration_seconds_count'
+        '{view="pages:about",method="GET",status="200"}'
+    )
+    client.get('/pages/about/')
+    own = read_sample(client, sample)
+    shutil.copy(
+        tmp_path / REGISTRY.file_name, tmp_path / 'another-worker.json'
+    )
+    assert read_sample(client, sample) == own * 2, (
+        "Убедитесь, что метрики всех рабочих процессов из METRICS_DIR"
+        " суммируются."
+    )
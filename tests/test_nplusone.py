@@ -0,0 +1,74 @@
+import logging
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def repeated_queries_view(request):
+    from django.http import HttpResponse
+
+    User = get_user_model()
+    for user in User.objects.all():
+        User.objects.get(pk=user.pk)
+    return HttpResponse()
+
+
+def run_middleware(view=repeated_queries_view):
+    from blogicum.nplusone import NPlusOneMiddleware
+
+    request = RequestFactory().get('/feed/')
+    request.resolver_match = None
+    return NPlusOneMiddleware(view)(request)
+
+
+@pytest.fixture
+def users(mixer):
+    return mixer.cycle(3).blend(get_user_model())
+
+
+def test_repeated_queries_raise(users):
+    from blogicum.nplusone import NPlusOneError
+
+    with pytest.raises(NPlusOneError, match='3 x SELECT'):
+        run_middleware()
+
+
+def test_repeated_queries_logged(settings, users, caplog):
+    settings.NPLUSONE_MODE = 'log'
+    with caplog.at_level(logging.WARNING, logger='blogicum.nplusone'):
+        run_middleware()
+    assert 'N+1 queries in GET /feed/' in caplog.text, (
+        "Убедитесь, что в режиме NPLUSONE_MODE='log' повторяющиеся запросы"
+        " записываются в журнал."
+    )
+
+
+def test_whitelist(settings, users):
+    from blogicum.nplusone import allow_repeated_queries
+
+    run_middleware(allow_repeated_queries()(repeated_queries_view))
+    settings.NPLUSONE_WHITELIST = [r'FROM "auth_user"']
+    run_middleware()
+
+
+@pytest.mark.parametrize('url', ['category', 'profile'])
+def test_post_lists_without_n_plus_one(
+    client, many_posts_with_published_locations, url
+):
+    from blog.models import Post
+
+    Post.objects.update(
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+    post = many_posts_with_published_locations[0]
+    url = {
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{post.author.username}/',
+    }[url]
+    # The autouse fixture of conftest raises NPlusOneError on the request.
+    assert client.get(url).status_code == 200
@@ -0,0 +1,44 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+# session, user, object
+N_QUERIES_OWNER_CHECK = 3
+# plus category and location choices of the form
+N_QUERIES_EDIT_POST_FORM = N_QUERIES_OWNER_CHECK + 2
+
+
+@pytest.fixture
+def own_comment(comment_to_a_post, post_with_published_location):
+    comment = comment_to_a_post
+    comment.author = post_with_published_location.author
+    comment.save()
+    return comment
+
+
+def test_owner_check_query_count(
+        django_assert_num_queries, user_client, another_user_client,
+        post_with_published_location, own_comment
+):
+    post_url = f'/posts/{post_with_published_location.id}/'
+    comment_url = f'{post_url}edit_comment/{own_comment.id}/'
+
+    with django_assert_num_queries(N_QUERIES_EDIT_POST_FORM):
+        assert user_client.get(f'{post_url}edit/').status_code == 200
+    with django_assert_num_queries(N_QUERIES_OWNER_CHECK):
+        assert user_client.get(comment_url).status_code == 200
+    for url in (f'{post_url}edit/', f'{post_url}delete/', comment_url):
+        with django_assert_num_queries(N_QUERIES_OWNER_CHECK):
+            assert another_user_client.get(url).status_code == 302
+
+
+def test_comment_edit_keeps_counter(
+        user_client, post_with_published_location, own_comment
+):
+    post = post_with_published_location
+    user_client.post(
+        f'/posts/{post.id}/edit_comment/{own_comment.id}/',
+        {'text': 'Исправленный комментарий'}
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_counting_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, len(queries)
+
+
+@pytest.mark.parametrize('url', [
+    '/', '/?page=2', '/category/{category.slug}/', '/posts/{post.id}/'
+])
+def test_anonymous_pages_are_cached(
+        client, url, published_category,
+        post_with_published_location, many_posts_with_published_locations
+):
+    url = url.format(
+        category=published_category, post=post_with_published_location
+    )
+    first = client.get(url)
+    response, n_queries = get_counting_queries(client, url)
+    assert n_queries == 0, (
+        "Убедитесь, что страницы для анонимных пользователей берутся из"
+        " кеша."
+    )
+    assert response.content == first.content
+
+
+def test_comment_invalidates_only_its_post(
+        mixer: Mixer, client, user_client, post_with_published_location,
+        post_of_another_author
+):
+    commented = f'/posts/{post_with_published_location.id}/'
+    other = f'/posts/{post_of_another_author.id}/'
+    client.get(commented)
+    client.get(other)
+    client.get('/')
+
+    user_client.post(f'{commented}comment/', {'text': 'Новый комментарий'})
+
+    response, n_queries = get_counting_queries(client, commented)
+    assert n_queries > 0
+    assert 'Новый комментарий' in response.content.decode()
+    assert get_counting_queries(client, other)[1] == 0
+    assert get_counting_queries(client, '/')[1] > 0
+
+
+def test_authenticated_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    user_client.get('/')
+    assert get_counting_queries(user_client, '/')[1] > 0
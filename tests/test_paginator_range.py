@@ -0,0 +1,44 @@
+import re
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def one_post_per_page(monkeypatch):
+    from blog.views import PaginateMixin
+
+    monkeypatch.setattr(PaginateMixin, 'paginate_by', 1)
+
+
+def test_paginator_links_are_bounded(
+        settings, one_post_per_page, user_client,
+        many_posts_with_published_locations
+):
+    settings.NUMBER_OF_PAGINATOR_PAGES = 5
+    num_pages = len(many_posts_with_published_locations)
+    response = user_client.get('/', {'page': num_pages // 2})
+    content = response.content.decode()
+    numbers = {
+        int(number) for number in re.findall(
+            r'<a class="page-link" href="\?page=\d+">(\d+)</a>', content
+        )
+    }
+    assert len(numbers) <= settings.NUMBER_OF_PAGINATOR_PAGES + 2, (
+        "Убедитесь, что пагинатор выводит ограниченное количество"
+        " ссылок на страницы, а не ссылку на каждую страницу."
+    )
+    assert {1, num_pages} <= numbers
+    assert content.count('<span class="page-link">…</span>') == 2, (
+        "Убедитесь, что пропущенные номера страниц заменяются многоточием."
+    )
+
+
+def test_paginator_shows_all_pages_when_few(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/')
+    assert list(response.context['page_range']) == list(
+        response.context['paginator'].page_range
+    )
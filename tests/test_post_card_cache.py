@@ -0,0 +1,88 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def rendered_templates(response):
+    return [template.name for template in response.templates]
+
+
+def test_post_card_is_reused_across_lists(
+        user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    index = user_client.get('/')
+    assert POST_CARD_TEMPLATE in rendered_templates(index)
+
+    profile = user_client.get(f'/profile/{user.username}/')
+    category = user_client.get(f'/category/{post.category.slug}/')
+    for response in (profile, category):
+        assert POST_CARD_TEMPLATE not in rendered_templates(response), (
+            "Убедитесь, что карточка публикации берётся из кеша на всех"
+            " страницах со списком публикаций."
+        )
+        assert post.title in response.content.decode()
+
+
+def test_post_card_follows_category_changes(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get('/')
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    response = user_client.get(f'/profile/{post.author.username}/')
+    assert 'Новое название категории' in response.content.decode()
+
+
+def test_post_feed_links_match_reverse(
+        user_client, many_posts_with_published_locations
+):
+    from django.urls import reverse
+
+    response = user_client.get('/')
+    content = response.content.decode()
+    for post in response.context['page_obj']:
+        for url in (
+            reverse('blog:profile', args=[post.author.username]),
+            reverse('blog:post_detail', args=[post.pk]),
+            reverse('blog:category_posts', args=[post.category.slug]),
+        ):
+            assert f'href="{url}"' in content, (
+                "Убедитесь, что ссылки в карточках публикаций ленты"
+                " совпадают с адресами, построенными через reverse()."
+            )
+
+
+def test_post_card_follows_username_changes(
+        user_client, post_with_published_location
+):
+    author = post_with_published_location.author
+    user_client.get('/')
+    author.username = 'renamed_author'
+    author.save()
+    assert '@renamed_author' in user_client.get('/').content.decode(), (
+        "Убедитесь, что после смены имени пользователя карточки его"
+        " публикаций обновляются."
+    )
+
+
+def test_post_cards_survive_other_user_saves(
+        django_user_model, user, post_with_published_location
+):
+    from blog.cache import get_generations
+
+    groups = ('feed', 'list_pages', 'posts')
+    before = get_generations(*groups)
+    django_user_model.objects.create_user('newcomer', password='secret')
+    user.set_password('new_secret')
+    user.save()
+    user.first_name = 'Имя'
+    user.save()
+    assert get_generations(*groups) == before, (
+        "Убедитесь, что регистрация, смена пароля и другие изменения"
+        " профиля без смены имени пользователя не сбрасывают"
+        " закешированные страницы."
+    )
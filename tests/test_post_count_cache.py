@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, sum('COUNT(' in q['sql'].upper() for q in queries)
+
+
+def test_feed_count_is_cached_and_invalidated(
+        mixer: Mixer, client, user, many_posts_with_published_locations,
+        published_category
+):
+    _, first = count_queries(client, '/')
+    _, second = count_queries(client, '/')
+    assert first == 1
+    assert second == 0, (
+        "Убедитесь, что общее количество публикаций для пагинатора"
+        " берётся из кеша."
+    )
+
+    mixer.cycle(11).blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=many_posts_with_published_locations[0].pub_date,
+    )
+    response, after_save = count_queries(client, '/')
+    assert after_save == 1, (
+        "Убедитесь, что кеш количества публикаций сбрасывается при"
+        " сохранении публикации."
+    )
+    assert response.context['paginator'].count == (
+        response.context['paginator'].object_list.count()
+    )
@@ -0,0 +1,37 @@
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# session, user, post with author, location and category, comments
+N_QUERIES_LOGGED_IN = 4
+# post with author, location and category, comments
+N_QUERIES_ANONYMOUS = 2
+
+
+@pytest.fixture
+def commented_post(mixer: Mixer, post_with_published_location):
+    mixer.cycle(5).blend('blog.Comment', post=post_with_published_location)
+    return post_with_published_location
+
+
+def test_detail_page_query_count(
+        django_assert_num_queries, user_client, another_user_client,
+        client, commented_post
+):
+    url = f'/posts/{commented_post.id}/'
+    for logged_in_client in (user_client, another_user_client):
+        with django_assert_num_queries(N_QUERIES_LOGGED_IN):
+            logged_in_client.get(url)
+    with django_assert_num_queries(N_QUERIES_ANONYMOUS):
+        client.get(url)
+
+
+def test_unpublished_post_hidden_from_others(
+        user_client, another_user_client, commented_post
+):
+    commented_post.is_published = False
+    commented_post.save()
+    url = f'/posts/{commented_post.id}/'
+    assert user_client.get(url).status_code == 200
+    assert another_user_client.get(url).status_code == 404
@@ -0,0 +1,76 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(1000))
+
+
+def test_excerpt_is_stored_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == ' '.join(LONG_TEXT.split()[:10]) + ' …', (
+        "Убедитесь, что при сохранении публикации в ней сохраняется"
+        " начало текста."
+    )
+
+    post.text = 'Новый текст'
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.excerpt == 'Новый текст'
+
+
+def test_feed_does_not_load_text(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/')
+    assert post.excerpt in response.content.decode()
+    assert 'слово999' not in response.content.decode()
+    assert not any(
+        '"blog_post"."text"' in query['sql'] for query in queries
+    ), (
+        "Убедитесь, что списки публикаций не загружают полный текст"
+        " публикаций."
+    )
+
+
+def test_fill_excerpts_fixes_outdated(post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(text=LONG_TEXT)
+    out = StringIO()
+    call_command('fill_excerpts', stdout=out)
+    post.refresh_from_db()
+    assert post.excerpt.startswith('слово0 слово1'), (
+        "Убедитесь, что команда fill_excerpts обновляет начало текста"
+        " публикаций."
+    )
+    assert 'Обновлено публикаций: 1' in out.getvalue()
+
+
+def test_fill_excerpts_drops_cached_pages(post_with_published_location):
+    from blog.cache import get_generations
+    from blog.models import Post
+
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        text=LONG_TEXT
+    )
+    groups = ('posts', 'feed', 'list_pages')
+    before = get_generations(*groups)
+    call_command('fill_excerpts', stdout=StringIO())
+    after = get_generations(*groups)
+    assert all(old != new for old, new in zip(before, after)), (
+        "Убедитесь, что после обновления начала текста публикаций"
+        " сбрасываются закешированные страницы и карточки публикаций."
+    )
@@ -0,0 +1,76 @@
+import logging
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.test import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def timing_client(settings, user):
+    settings.REQUEST_TIMING = True
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def test_server_timing_header(timing_client, post_with_published_location):
+    response = timing_client.get('/')
+    metrics = {
+        metric.split(';')[0]: metric
+        for metric in response['Server-Timing'].split(', ')
+    }
+    assert {'db', 'view', 'render', 'total'} <= set(metrics), (
+        "Убедитесь, что заголовок Server-Timing содержит время SQL-запросов,"
+        " представления, отрисовки шаблона и общее время."
+    )
+    assert 'queries"' in metrics['db']
+
+
+def test_timing_is_opt_in(user_client):
+    assert 'Server-Timing' not in user_client.get('/')
+
+
+def test_slow_requests_are_logged(settings, timing_client, caplog):
+    settings.REQUEST_TIMING_SLOW_MS = 0
+    with caplog.at_level(logging.WARNING, logger='blogicum.timing'):
+        timing_client.get('/')
+    assert 'Slow request GET / (blog:index)' in caplog.text, (
+        "Убедитесь, что медленные запросы записываются в журнал вместе"
+        " с самыми долгими SQL-запросами."
+    )
+    assert 'SELECT' in caplog.text
+
+
+def test_request_timings_command(settings, tmp_path, timing_client):
+    settings.METRICS_DIR = str(tmp_path)
+    call_command('request_timings', reset=True, stdout=StringIO())
+    for _ in range(3):
+        timing_client.get('/')
+    timing_client.get('/pages/about/')
+    out = StringIO()
+    call_command('request_timings', stdout=out)
+    rows = {
+        line.split()[0]: line.split()
+        for line in out.getvalue().splitlines()[1:]
+    }
+    assert rows['blog:index'][1] == '3', (
+        "Убедитесь, что статистика запросов собирается по именам адресов."
+    )
+    assert rows['pages:about'][1] == '1'
+    assert float(rows['blog:index'][6]) > 0, (
+        "Убедитесь, что статистика включает время SQL-запросов."
+    )
+
+    call_command('request_timings', reset=True, stdout=StringIO())
+    out = StringIO()
+    call_command('request_timings', stdout=out)
+    assert 'blog:index' not in out.getvalue()
+
+
+def test_request_timings_requires_shared_directory(settings):
+    settings.METRICS_DIR = None
+    with pytest.raises(CommandError, match='METRICS_DIR'):
+        call_command('request_timings', stdout=StringIO())
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_appears_without_restart(
+        mixer: Mixer, monkeypatch, client, user, published_category
+):
+    now = timezone.now()
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=now + timedelta(minutes=2),
+    )
+    assert post not in client.get('/').context['page_obj']
+
+    monkeypatch.setattr(
+        timezone, 'now', lambda: now + timedelta(minutes=4)
+    )
+    assert post in client.get('/').context['page_obj'], (
+        "Убедитесь, что отложенная публикация появляется на главной"
+        " странице после наступления даты публикации."
+    )
+
+
+def test_feed_page_is_cached_within_bucket(
+        user_client, many_posts_with_published_locations
+):
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/')
+    assert len(response.context['page_obj']) > 0
+    assert not any('FROM "blog_post"' in q['sql'] for q in queries), (
+        "Убедитесь, что публикации страницы ленты берутся из кеша в"
+        " пределах интервала округления текущего времени."
+    )
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Настройки только для SQLite.'
+    ),
+]
+
+MANAGE_PY = Path(__file__).resolve().parent.parent / 'blogicum' / 'manage.py'
+
+
+@pytest.mark.django_db
+def test_connection_pragmas_are_applied():
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        busy_timeout = cursor.fetchone()[0]
+        cursor.execute('PRAGMA synchronous')
+        synchronous = cursor.fetchone()[0]
+    assert busy_timeout == connection.settings_dict['PRAGMAS'][
+        'busy_timeout'
+    ], "Убедитесь, что для соединений SQLite задаётся busy_timeout."
+    assert synchronous == 1, (
+        "Убедитесь, что для соединений SQLite задаётся synchronous=NORMAL."
+    )
+
+
+def test_concurrent_comments_do_not_lock_database(tmp_path):
+    env = {**os.environ, 'DB_NAME': str(tmp_path / 'db.sqlite3')}
+    for command in (
+        ['migrate', '-v0'],
+        ['stress_comments', '--writers=4', '--readers=2', '--comments=10'],
+    ):
+        result = subprocess.run(
+            [sys.executable, str(MANAGE_PY), *command],
+            env=env, capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, (
+            "Убедитесь, что комментарии добавляются в нескольких потоках"
+            " одновременно с чтением ленты без ошибок блокировки базы"
+            f" данных.\n{result.stdout}{result.stderr}"
+        )
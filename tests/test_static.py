@@ -0,0 +1,131 @@
+import gzip
+import json
+from importlib import reload
+
+import brotli
+import pytest
+from django.core.management import call_command
+from django.urls import Resolver404, clear_url_caches, resolve
+
+CSS = 'body { background: url("../img/logo.png"); }\n' * 20
+
+
+def reload_urls():
+    import blogicum.urls
+
+    reload(blogicum.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def serve_static(settings):
+    settings.SERVE_STATIC = True
+    reload_urls()
+    yield
+    settings.SERVE_STATIC = False
+    reload_urls()
+
+
+@pytest.fixture
+def collected(settings, tmp_path, serve_static):
+    source = tmp_path / 'static'
+    (source / 'css').mkdir(parents=True)
+    (source / 'img').mkdir()
+    (source / 'css' / 'style.css').write_text(CSS)
+    (source / 'img' / 'logo.png').write_bytes(b'png')
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / 'collected'
+    settings.STATICFILES_STORAGE = (
+        'blogicum.storage.CompressedManifestStaticFilesStorage'
+    )
+    call_command('build_static', skip_vendor=True, verbosity=0)
+    manifest = json.loads(
+        (settings.STATIC_ROOT / 'staticfiles.json').read_text()
+    )
+    return settings.STATIC_ROOT, manifest['paths']
+
+
+def test_build_static_writes_hashed_compressed_files(collected):
+    root, paths = collected
+    hashed = paths['css/style.css']
+    assert hashed != 'css/style.css', (
+        "Убедитесь, что имена статических файлов содержат хеш содержимого."
+    )
+    content = (root / hashed).read_bytes()
+    assert paths['img/logo.png'].encode() in content
+    assert gzip.decompress((root / f'{hashed}.gz').read_bytes()) == content
+    assert brotli.decompress((root / f'{hashed}.br').read_bytes()) == content
+    assert not (root / f'{paths["img/logo.png"]}.gz').exists(), (
+        "Убедитесь, что сжатые копии создаются только для текстовых файлов."
+    )
+
+
+@pytest.mark.parametrize('accept_encoding, content_encoding', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip, br;q=0', 'gzip'),
+    ('', None),
+])
+def test_static_served_precompressed_and_immutable(
+        client, collected, accept_encoding, content_encoding
+):
+    _, paths = collected
+    url = f'/static/{paths["css/style.css"]}'
+    response = client.get(url, HTTP_ACCEPT_ENCODING=accept_encoding)
+    assert response.status_code == 200
+    assert response.get('Content-Encoding') == content_encoding, (
+        "Убедитесь, что отдаётся заранее сжатая копия, которую принимает"
+        " клиент."
+    )
+    assert response['Content-Type'].startswith('text/css')
+    assert 'Accept-Encoding' in response['Vary']
+    assert 'immutable' in response['Cache-Control'], (
+        "Убедитесь, что файлы с хешем в имени кешируются навсегда."
+    )
+    response = client.get(
+        url, HTTP_ACCEPT_ENCODING=accept_encoding,
+        HTTP_IF_NONE_MATCH=response['ETag'],
+    )
+    assert response.status_code == 304
+
+
+def test_unhashed_static_is_revalidated(client, collected):
+    response = client.get('/static/css/style.css')
+    assert response.status_code == 200
+    assert 'immutable' not in response['Cache-Control']
+
+
+def test_static_not_served_without_setting(settings):
+    settings.SERVE_STATIC = False
+    reload_urls()
+    with pytest.raises(Resolver404):
+        resolve('/static/css/style.css')
+    settings.SERVE_STATIC = True
+    reload_urls()
+    assert resolve('/static/css/style.css').url_name == 'static', (
+        "Убедитесь, что Django отдаёт статику только при DEBUG или"
+        " SERVE_STATIC."
+    )
+    settings.SERVE_STATIC = False
+    reload_urls()
+
+
+@pytest.mark.django_db
+def test_bootstrap_served_locally_once_vendored(
+        settings, tmp_path, user_client
+):
+    from pages.templatetags.assets import is_vendored
+
+    settings.STATICFILES_DIRS = [tmp_path]
+    is_vendored.cache_clear()
+    assert 'cdn.jsdelivr.net' in user_client.get('/').content.decode()
+
+    (tmp_path / 'vendor' / 'bootstrap').mkdir(parents=True)
+    (tmp_path / 'vendor' / 'bootstrap' / 'bootstrap.min.css').write_text('')
+    is_vendored.cache_clear()
+    content = user_client.get('/').content.decode()
+    is_vendored.cache_clear()
+    assert '/static/vendor/bootstrap/bootstrap.min.css' in content, (
+        "Убедитесь, что после сборки статики Bootstrap подключается"
+        " с сайта, а не с CDN."
+    )
+    assert 'cdn.jsdelivr.net' not in content
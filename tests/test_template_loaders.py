@@ -0,0 +1,46 @@
+import importlib
+
+import pytest
+from django.core.management import call_command
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+@pytest.fixture
+def production_templates(settings):
+    production = importlib.import_module('blogicum.settings_production')
+    settings.TEMPLATES = production.TEMPLATES
+    return production
+
+
+def test_production_profile_caches_templates(production_templates):
+    assert production_templates.DEBUG is False
+    loader = engines['django'].engine.template_loaders[0]
+    assert isinstance(loader, CachedLoader), (
+        "Убедитесь, что в настройках для продакшена шаблоны загружаются"
+        " кешированным загрузчиком."
+    )
+
+
+def test_warm_up_compiles_all_templates(production_templates):
+    from blogicum.warmup import warm_up_templates
+
+    compiled = warm_up_templates()
+    loader = engines['django'].engine.template_loaders[0]
+    assert compiled > 0
+    for name in (
+        'blog/index.html', 'includes/post_card.html',
+        'includes/category_link.html', 'includes/paginator.html',
+    ):
+        assert name in loader.get_template_cache, (
+            f"Убедитесь, что шаблон `{name}` компилируется при запуске"
+            " воркера."
+        )
+
+
+@pytest.mark.django_db
+def test_benchmark_templates(capsys, many_posts_with_published_locations):
+    call_command('benchmark_templates', renders=2)
+    output = capsys.readouterr().out
+    assert 'без кеширования шаблонов' in output
+    assert 'с кешированным загрузчиком' in output